@@ -2,16 +2,148 @@
 AI Chat API endpoints - Phase 4 Low Priority
 Handles AI assistant chat functionality
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import Optional
-from datetime import datetime
-import uuid
+import json
+import re
+import secrets
+from collections import deque
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..models import storage, AIChatRequest
+from ..core.responses import DefaultResponse
+from ..core.clock import now_iso
 
 router = APIRouter(prefix="/api/ai-chat", tags=["ai-chat"])
 
 
+# Response categories in priority order: when a message hits keywords of
+# several categories, the earliest category in this list wins. Keywords
+# match at the start of a word, so inflected forms count ("statistics",
+# "accidents", "lanes"); keywords shorter than _PREFIX_MIN_LEN must match
+# the whole word ("hi" does not match "this" or "his")
+CHAT_KEYWORDS = (
+    ("hello", frozenset({"hello", "hi", "hey"})),
+    ("help", frozenset({"help", "what can you do"})),
+    ("fatigue", frozenset({"fatigue", "tired", "drowsy"})),
+    ("collision", frozenset({"collision", "crash", "accident"})),
+    ("lane", frozenset({"lane", "departure", "ldw"})),
+    ("model", frozenset({"model", "yolo", "ai"})),
+    ("statistic", frozenset({"statistic", "stats", "dashboard"})),
+)
+
+CHAT_RESPONSES = {
+    "hello": "Hello! I'm your ADAS assistant. How can I help you today?",
+    "help": """I can help you with:
+- Analyzing dashcam videos for safety events
+- Monitoring driver fatigue and distraction
+- Providing safety statistics and insights
+- Answering questions about ADAS features
+- Managing video datasets and detections
+
+What would you like to know?""",
+    "fatigue": """Driver fatigue detection uses facial landmarks to monitor:
+- Eye Aspect Ratio (EAR) - detects eye closure
+- Mouth Aspect Ratio (MAR) - detects yawning
+- Head pose angles - detects head nodding
+
+The system triggers alerts when fatigue indicators exceed thresholds. Recommendations include taking breaks every 2 hours.""",
+    "collision": """Forward Collision Warning (FCW) uses:
+- Object detection (YOLOv11) to identify vehicles ahead
+- Distance estimation for calculating Time-to-Collision (TTC)
+- Speed differential analysis
+- Lane position tracking
+
+Critical alerts trigger when TTC < 2 seconds or following distance < safe threshold.""",
+    "lane": """Lane Departure Warning detects when your vehicle drifts from the lane without signaling. It uses curved lane detection with polynomial fitting to track lane boundaries and calculates vehicle offset from lane center.""",
+    "model": """Available AI models:
+- YOLOv11n: Lightweight detection (6.2MB, 89% accuracy, 15ms)
+- YOLOv11s: Balanced detection (12.5MB, 92% accuracy, 25ms)
+- YOLOv11m: High accuracy (25.8MB, 94% accuracy, 40ms)
+- MediaPipe Face: Driver monitoring (8.5MB, 96% accuracy)
+- Depth Anything: Distance estimation (335MB, 91% accuracy)""",
+}
+
+
+def _json(value) -> bytes:
+    """JSON-encode a single value (orjson if available, stdlib otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+# Canned replies are constant, so they are JSON-encoded once at import
+_CHAT_RESPONSES_JSON = {category: _json(text) for category, text in CHAT_RESPONSES.items()}
+
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+_PREFIX_MIN_LEN = 4
+
+# (category, single-word keywords, space-padded multi-word phrases)
+_KEYWORD_TABLE = tuple(
+    (
+        category,
+        frozenset(k for k in keywords if " " not in k),
+        tuple(f" {k} " for k in keywords if " " in k),
+    )
+    for category, keywords in CHAT_KEYWORDS
+)
+
+# Lengths at which a word is cut to look up keywords used as prefixes
+_PREFIX_LENGTHS = sorted({
+    len(k) for _, keywords in CHAT_KEYWORDS for k in keywords
+    if " " not in k and len(k) >= _PREFIX_MIN_LEN
+})
+
+
+def match_chat_category(message_lower: str) -> Optional[str]:
+    """
+    Response category for a lowercased message, or None.
+    
+    The message is tokenized once, and each word is added together with
+    its leading parts at the keyword lengths; each category is then a set
+    intersection against its keywords (phrases are matched on the
+    space-joined tokens, so they respect word boundaries too).
+    """
+    words = _WORD_RE.findall(message_lower)
+    tokens = set(words)
+    tokens.update(
+        word[:n] for word in words for n in _PREFIX_LENGTHS if n < len(word)
+    )
+    joined = None
+    for category, keywords, phrases in _KEYWORD_TABLE:
+        if not keywords.isdisjoint(tokens):
+            return category
+        if phrases:
+            if joined is None:
+                joined = f" {' '.join(words)} "
+            if any(phrase in joined for phrase in phrases):
+                return category
+    return None
+
+
+def _store_chat_message(message: dict):
+    """Append a message to the chat history and its session's index."""
+    history = storage.chat_history
+    if len(history) == history.maxlen:
+        # The deque drops its oldest message on append, which is also the
+        # oldest message of that message's session
+        evicted = history[0]
+        bucket = storage.chat_by_session.get(evicted["session_id"])
+        if bucket:
+            bucket.popleft()
+            if not bucket:
+                del storage.chat_by_session[evicted["session_id"]]
+    history.append(message)
+    storage.chat_by_session.setdefault(message["session_id"], deque()).append(message)
+
+
 @router.post("")
 async def chat_with_ai(request: AIChatRequest):
     """
@@ -27,48 +159,15 @@ async def chat_with_ai(request: AIChatRequest):
     - session_id: Session ID for continuing conversation
     """
     # Generate or use existing session ID
-    session_id = request.session_id or str(uuid.uuid4())
+    session_id = request.session_id or secrets.token_urlsafe(16)
     
     # Generate dummy AI response based on message keywords
     message_lower = request.message.lower()
     
     # Simple keyword-based responses (dummy AI)
-    if any(word in message_lower for word in ["hello", "hi", "hey"]):
-        response = "Hello! I'm your ADAS assistant. How can I help you today?"
-    elif any(word in message_lower for word in ["help", "what can you do"]):
-        response = """I can help you with:
-- Analyzing dashcam videos for safety events
-- Monitoring driver fatigue and distraction
-- Providing safety statistics and insights
-- Answering questions about ADAS features
-- Managing video datasets and detections
-
-What would you like to know?"""
-    elif any(word in message_lower for word in ["fatigue", "tired", "drowsy"]):
-        response = """Driver fatigue detection uses facial landmarks to monitor:
-- Eye Aspect Ratio (EAR) - detects eye closure
-- Mouth Aspect Ratio (MAR) - detects yawning
-- Head pose angles - detects head nodding
-
-The system triggers alerts when fatigue indicators exceed thresholds. Recommendations include taking breaks every 2 hours."""
-    elif any(word in message_lower for word in ["collision", "crash", "accident"]):
-        response = """Forward Collision Warning (FCW) uses:
-- Object detection (YOLOv11) to identify vehicles ahead
-- Distance estimation for calculating Time-to-Collision (TTC)
-- Speed differential analysis
-- Lane position tracking
-
-Critical alerts trigger when TTC < 2 seconds or following distance < safe threshold."""
-    elif any(word in message_lower for word in ["lane", "departure", "ldw"]):
-        response = """Lane Departure Warning detects when your vehicle drifts from the lane without signaling. It uses curved lane detection with polynomial fitting to track lane boundaries and calculates vehicle offset from lane center."""
-    elif any(word in message_lower for word in ["model", "yolo", "ai"]):
-        response = """Available AI models:
-- YOLOv11n: Lightweight detection (6.2MB, 89% accuracy, 15ms)
-- YOLOv11s: Balanced detection (12.5MB, 92% accuracy, 25ms)
-- YOLOv11m: High accuracy (25.8MB, 94% accuracy, 40ms)
-- MediaPipe Face: Driver monitoring (8.5MB, 96% accuracy)
-- Depth Anything: Distance estimation (335MB, 91% accuracy)"""
-    elif any(word in message_lower for word in ["statistic", "stats", "dashboard"]):
+    category = match_chat_category(message_lower)
+    response_json = None
+    if category == "statistic":
         response = f"""Current system statistics:
 - Total videos processed: {len(storage.videos)}
 - Total detections: {len(storage.detections)}
@@ -76,14 +175,17 @@ Critical alerts trigger when TTC < 2 seconds or following distance < safe thresh
 - Trips completed: {len([t for t in storage.trips.values() if t.status.value == 'completed'])}
 
 Would you like more detailed analytics?"""
+    elif category is not None:
+        response = CHAT_RESPONSES[category]
+        response_json = _CHAT_RESPONSES_JSON[category]
     else:
         response = f"I understand you're asking about: '{request.message}'. Let me help you with that. Could you provide more specific details about what you'd like to know?"
     
     # Store in chat history
-    timestamp = datetime.now().isoformat()
+    timestamp = now_iso()
     
     # Add user message
-    storage.chat_history.append({
+    _store_chat_message({
         "id": len(storage.chat_history) + 1,
         "session_id": session_id,
         "role": "user",
@@ -92,7 +194,7 @@ Would you like more detailed analytics?"""
     })
     
     # Add assistant response
-    storage.chat_history.append({
+    _store_chat_message({
         "id": len(storage.chat_history) + 1,
         "session_id": session_id,
         "role": "assistant",
@@ -100,17 +202,21 @@ Would you like more detailed analytics?"""
         "timestamp": timestamp
     })
     
-    # Keep only last 500 messages
-    if len(storage.chat_history) > 500:
-        storage.chat_history = storage.chat_history[-500:]
-    
-    return {
-        "success": True,
-        "message": request.message,
-        "response": response,
-        "timestamp": timestamp,
-        "session_id": session_id
-    }
+    # Only the message, session id and timestamp vary per request: splice
+    # them around the (usually pre-encoded) reply instead of encoding the
+    # whole body
+    if response_json is None:
+        response_json = _json(response)
+    return Response(
+        content=b"".join((
+            b'{"success":true,"message":', _json(request.message),
+            b',"response":', response_json,
+            b',"timestamp":', _json(timestamp),
+            b',"session_id":', _json(session_id),
+            b"}",
+        )),
+        media_type="application/json"
+    )
 
 
 @router.get("/history")
@@ -125,22 +231,25 @@ async def get_chat_history(
     - session_id: Optional session ID to filter by
     - limit: Maximum number of messages to return (default: 50)
     """
-    messages = storage.chat_history.copy()
-    
-    # Filter by session if provided
+    # Session lookup goes through the per-session index instead of a scan
     if session_id:
-        messages = [m for m in messages if m.get("session_id") == session_id]
-    
-    # Sort by timestamp (most recent last for conversation flow)
-    messages.sort(key=lambda x: x.get("timestamp", ""))
+        source = storage.chat_by_session.get(session_id, ())
+    else:
+        source = storage.chat_history
     
-    # Limit results
-    messages = messages[-limit:] if len(messages) > limit else messages
+    # Messages are appended in time order, so the history is already sorted
+    # (most recent last for conversation flow): take the last `limit` ones
+    # walking back from the end instead of copying and sorting everything
+    if 0 < limit < len(source):
+        messages = list(islice(reversed(source), limit))
+        messages.reverse()
+    else:
+        messages = list(source)
     
-    return {
+    return DefaultResponse({
         "success": True,
         "messages": messages
-    }
+    })
 
 
 @router.delete("/session/{id}")
@@ -152,15 +261,17 @@ async def delete_chat_session(id: str):
     - id: Session ID to delete
     """
     # Remove all messages from this session
-    initial_count = len(storage.chat_history)
-    storage.chat_history = [
-        m for m in storage.chat_history 
-        if m.get("session_id") != id
-    ]
-    deleted_count = initial_count - len(storage.chat_history)
-    
-    if deleted_count == 0:
+    session_messages = storage.chat_by_session.pop(id, None)
+    if not session_messages:
         raise HTTPException(status_code=404, detail=f"Session '{id}' not found")
+    deleted_count = len(session_messages)
+    
+    # History is bounded, so compacting it right away is cheap and keeps
+    # the eviction bookkeeping exact
+    storage.chat_history = deque(
+        (m for m in storage.chat_history if m["session_id"] != id),
+        maxlen=storage.chat_history.maxlen
+    )
     
     return {
         "success": True,
@@ -6,8 +6,11 @@ from fastapi import APIRouter, HTTPException, Header, Form
 from typing import Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
-import uuid
 import hashlib
+import hmac
+import secrets
+
+from ..core.clock import now_iso
 
 router = APIRouter(prefix="/api", tags=["authentication", "users"])
 
@@ -53,10 +56,34 @@ _users = {
     }
 }
 
+# Username -> user record (same dicts as _users), for O(1) login lookup
+_users_by_username = {u["username"]: u for u in _users.values()}
+
 # Active sessions (token -> user_id)
 _sessions = {}
 
 
+def _hash_password(password: str) -> str:
+    # Not cached: a cache would keep plaintext passwords alive as keys and
+    # make repeat attempts measurably faster than fresh ones
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _bearer_token(authorization: Optional[str]) -> str:
+    """Token from an 'Authorization: Bearer <token>' header, or 401."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=401,
+            detail="Missing or invalid authorization header"
+        )
+    return authorization[7:]
+
+
+# Compared against on unknown usernames so a miss costs the same hash +
+# compare as a wrong password (no username probing by response time)
+_DUMMY_PASSWORD_HASH = _hash_password(secrets.token_urlsafe(16))
+
+
 @router.post("/auth/login")
 async def login(request: LoginRequest):
     """
@@ -77,33 +104,24 @@ async def login(request: LoginRequest):
     - analyst / analyst123 (analyst role)
     """
     # Find user by username
-    user = None
-    for u in _users.values():
-        if u["username"] == request.username:
-            user = u
-            break
-    
-    if not user:
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid username or password"
-        )
+    user = _users_by_username.get(request.username)
     
-    # Check password
-    password_hash = hashlib.sha256(request.password.encode()).hexdigest()
-    if password_hash != user["password_hash"]:
+    # Check password (constant-time compare, also for unknown users)
+    password_hash = _hash_password(request.password)
+    expected_hash = user["password_hash"] if user else _DUMMY_PASSWORD_HASH
+    if not hmac.compare_digest(password_hash, expected_hash) or not user:
         raise HTTPException(
             status_code=401,
             detail="Invalid username or password"
         )
     
     # Generate token (dummy - in production use JWT)
-    token = str(uuid.uuid4())
+    token = secrets.token_urlsafe(16)
     
     # Store session
     _sessions[token] = {
         "user_id": user["id"],
-        "created_at": datetime.now().isoformat(),
+        "created_at": now_iso(),
         "expires_at": (datetime.now() + timedelta(hours=24)).isoformat()
     }
     
@@ -133,13 +151,7 @@ async def logout(authorization: Optional[str] = Header(None)):
     
     Invalidates the current session token
     """
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Missing or invalid authorization header"
-        )
-    
-    token = authorization.replace("Bearer ", "")
+    token = _bearer_token(authorization)
     
     if token not in _sessions:
         raise HTTPException(
@@ -166,13 +178,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
     
     Returns user information for the authenticated user
     """
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Missing or invalid authorization header"
-        )
-    
-    token = authorization.replace("Bearer ", "")
+    token = _bearer_token(authorization)
     
     if token not in _sessions:
         raise HTTPException(
@@ -218,13 +224,7 @@ async def list_users(authorization: Optional[str] = Header(None)):
     Returns list of all users (without passwords)
     """
     # Verify authentication
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Missing or invalid authorization header"
-        )
-    
-    token = authorization.replace("Bearer ", "")
+    token = _bearer_token(authorization)
     
     if token not in _sessions:
         raise HTTPException(
@@ -280,13 +280,7 @@ async def create_user(
     - email: Optional email address
     """
     # Verify authentication
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401,
-            detail="Missing or invalid authorization header"
-        )
-    
-    token = authorization.replace("Bearer ", "")
+    token = _bearer_token(authorization)
     
     if token not in _sessions:
         raise HTTPException(
@@ -307,12 +301,11 @@ async def create_user(
         )
     
     # Check if username exists
-    for user in _users.values():
-        if user["username"] == request.username:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Username '{request.username}' already exists"
-            )
+    if request.username in _users_by_username:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Username '{request.username}' already exists"
+        )
     
     # Validate role
     if request.role not in ["admin", "driver", "analyst", "viewer"]:
@@ -322,8 +315,8 @@ async def create_user(
         )
     
     # Create new user
-    new_user_id = f"user_{str(uuid.uuid4())[:8]}"
-    password_hash = hashlib.sha256(request.password.encode()).hexdigest()
+    new_user_id = f"user_{secrets.token_urlsafe(6)}"
+    password_hash = _hash_password(request.password)
     
     new_user = {
         "id": new_user_id,
@@ -331,10 +324,11 @@ async def create_user(
         "password_hash": password_hash,
         "role": request.role,
         "email": request.email,
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
     
     _users[new_user_id] = new_user
+    _users_by_username[new_user["username"]] = new_user
     
     # Return user info (without password)
     user_info = {
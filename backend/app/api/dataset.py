@@ -8,6 +8,8 @@ from datetime import datetime
 import os
 
 from ..models import storage, DatasetItem, VideoStatus
+from ..core.responses import DefaultResponse
+from ..core.clock import now_iso
 
 router = APIRouter(prefix="/api/dataset", tags=["dataset"])
 
@@ -40,13 +42,13 @@ async def get_datasets(
     end_idx = start_idx + limit
     paginated_datasets = datasets[start_idx:end_idx]
     
-    return {
+    return DefaultResponse({
         "success": True,
-        "data": [d.model_dump() for d in paginated_datasets],
+        "data": [d.model_dump(mode="json") for d in paginated_datasets],
         "total": total,
         "page": page,
         "limit": limit
-    }
+    })
 
 
 @router.post("")
@@ -65,10 +67,13 @@ async def upload_dataset(
     - type: "video" or "image" (default: video)
     - tags: Optional comma-separated tags
     """
-    # Get file size
-    file_size_bytes = 0
-    content = await file.read()
-    file_size_bytes = len(content)
+    # Get file size (content is not stored, so don't read the body at all:
+    # Starlette has already spooled it, seeking to the end gives the size)
+    file_size_bytes = file.size
+    if file_size_bytes is None:
+        file.file.seek(0, os.SEEK_END)
+        file_size_bytes = file.file.tell()
+        file.file.seek(0)
     file_size_mb = file_size_bytes / (1024 * 1024)
     
     # Create dataset item
@@ -77,6 +82,7 @@ async def upload_dataset(
     
     # Mock file path
     year_month = datetime.now().strftime("%Y/%m")
+    uploaded_at = now_iso()
     file_path = f"/storage/videos/{year_month}/{file.filename}"
     
     # Determine duration for videos (dummy value)
@@ -84,7 +90,9 @@ async def upload_dataset(
     if type == "video":
         duration_seconds = 120.0  # Dummy duration
     
-    dataset_item = DatasetItem(
+    # Every field below is built server-side with the right type, so skip
+    # re-validating them
+    dataset_item = DatasetItem.model_construct(
         id=dataset_id,
         filename=file.filename,
         file_path=file_path,
@@ -93,7 +101,7 @@ async def upload_dataset(
         description=description,
         file_size_mb=round(file_size_mb, 2),
         duration_seconds=duration_seconds,
-        uploaded_at=datetime.now().isoformat(),
+        uploaded_at=uploaded_at,
         status=VideoStatus.UPLOADED,
         ready_for_training=False,
         metadata={
@@ -109,13 +117,13 @@ async def upload_dataset(
     # Also add to videos storage if it's a video
     if type == "video":
         from ..models import Video
-        video = Video(
+        video = Video.model_construct(
             id=dataset_id,
             filename=file.filename,
             file_path=file_path,
             video_url=f"/api/video/download/{dataset_id}/{file.filename}",
             file_size_mb=round(file_size_mb, 2),
-            uploaded_at=datetime.now().isoformat(),
+            uploaded_at=uploaded_at,
             status=VideoStatus.UPLOADED
         )
         storage.videos[dataset_id] = video
@@ -178,7 +186,7 @@ async def delete_dataset(id: int):
         storage.videos.pop(id)
     
     # Remove associated detections
-    storage.detections = [d for d in storage.detections if d.video_id != id]
+    storage.detections.remove_video(id)
     
     return {
         "success": True,
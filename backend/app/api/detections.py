@@ -4,10 +4,11 @@ Handles object detection results from video/webcam
 """
 from fastapi import APIRouter, HTTPException
 from typing import Optional, List
-from datetime import datetime, timedelta
-from collections import Counter
+import heapq
 
 from ..models import storage, Detection, DetectionSaveRequest
+from ..core.responses import DefaultResponse
+from ..core.clock import now_iso
 
 router = APIRouter(prefix="/api/detections", tags=["detections"])
 
@@ -24,6 +25,7 @@ async def save_detections(request: DetectionSaveRequest):
     - metadata: Optional metadata
     """
     detection_ids = []
+    now = now_iso()
     
     for det_data in request.detections:
         detection_id = storage.detection_counter
@@ -35,7 +37,7 @@ async def save_detections(request: DetectionSaveRequest):
             class_id=det_data.get("class_id", 0),
             confidence=det_data.get("confidence", 0.0),
             bbox=det_data.get("bbox", [0, 0, 0, 0]),
-            timestamp=det_data.get("timestamp", datetime.now().isoformat()),
+            timestamp=det_data.get("timestamp", now),
             camera_id=request.camera_id,
             video_id=request.video_id
         )
@@ -64,22 +66,15 @@ async def get_recent_detections(
     - camera_id: Filter by camera ID
     - class_name: Filter by class name
     """
-    detections = storage.detections.copy()
+    # Apply filters on the store's interned id columns (no per-object scan)
+    detections = storage.detections.select(camera_id=camera_id, class_name=class_name)
     
-    # Apply filters
-    if camera_id:
-        detections = [d for d in detections if d.camera_id == camera_id]
+    # Top-N by timestamp (most recent first): O(N log limit) instead of a full sort.
+    # Timestamps have second resolution, so the id (insertion order) breaks
+    # ties and same-second detections still come newest first
+    detections = heapq.nlargest(limit, detections, key=lambda x: (x.timestamp, x.id))
     
-    if class_name:
-        detections = [d for d in detections if d.class_name == class_name]
-    
-    # Sort by timestamp (most recent first)
-    detections.sort(key=lambda x: x.timestamp, reverse=True)
-    
-    # Limit results
-    detections = detections[:limit]
-    
-    return {
+    return DefaultResponse({
         "success": True,
         "detections": [
             {
@@ -92,7 +87,7 @@ async def get_recent_detections(
             }
             for d in detections
         ]
-    }
+    })
 
 
 @router.get("/stats")
@@ -107,34 +102,28 @@ async def get_detection_stats():
     """
     detections = storage.detections
     
-    # Count by class
-    class_counter = Counter(d.class_name for d in detections)
-    
-    # Calculate average confidence per class
-    class_stats = []
-    for class_name, count in class_counter.items():
-        class_detections = [d for d in detections if d.class_name == class_name]
-        avg_confidence = sum(d.confidence for d in class_detections) / len(class_detections)
-        
-        class_stats.append({
+    # Per-class counts / confidence sums and per-camera counts: bincount
+    # passes over the store's columns
+    class_stats = [
+        {
             "class_name": class_name,
             "count": count,
-            "avg_confidence": round(avg_confidence, 3)
-        })
+            "avg_confidence": round(confidence_sum / count, 3)
+        }
+        for class_name, count, confidence_sum in detections.class_stats()
+    ]
     
     # Sort by count descending
     class_stats.sort(key=lambda x: x["count"], reverse=True)
     
-    # Count by camera
-    camera_counter = Counter(d.camera_id for d in detections if d.camera_id)
     camera_stats = [
         {"camera_id": camera_id, "count": count}
-        for camera_id, count in camera_counter.items()
+        for camera_id, count in detections.camera_counts()
     ]
     
-    return {
+    return DefaultResponse({
         "success": True,
         "total_detections": len(detections),
         "classes": class_stats,
         "by_camera": camera_stats
-    }
+    })
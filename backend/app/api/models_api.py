@@ -2,27 +2,179 @@
 Models API endpoints - Phase 1 Critical
 Handles AI model management and downloads
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Dict, List, Optional
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import logging
+
+import aiofiles
+import httpx
 
 from ..models import storage, ModelInfo
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/models", tags=["models"])
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+# Serialized catalog served by /available and /info. Rebuilt only after a
+# download/delete changes the catalog; the version doubles as the ETag.
+_catalog_cache: Optional[Dict[str, dict]] = None
+_catalog_version = 0
+
+
+def _catalog_snapshot() -> Dict[str, dict]:
+    """Return the cached model_dump() of every catalog entry."""
+    global _catalog_cache
+    if _catalog_cache is None:
+        _catalog_cache = {
+            model_id: model.model_dump()
+            for model_id, model in storage.models_catalog.items()
+        }
+    return _catalog_cache
+
+
+def _invalidate_catalog():
+    """Drop the cached catalog after a mutation."""
+    global _catalog_cache, _catalog_version
+    _catalog_cache = None
+    _catalog_version += 1
+
+
+class ChecksumMismatch(Exception):
+    """Downloaded weights don't match the catalog sha256"""
+    pass
+
+
+class NotAModelFile(Exception):
+    """download_url served a web page instead of a weights file"""
+    pass
+
+
+# One lock per model id: concurrent requests for the same model would
+# otherwise append to the same .part file
+_download_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _sha256_file(path: Path, digest=None):
+    """Feed a file into a sha256 digest (blocking, run in a thread)"""
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest
+
+
+async def _download_weights(model: ModelInfo) -> str:
+    """
+    Stream model weights from download_url into MODELS_DIR.
+    
+    Chunks are written through aiofiles so the event loop keeps serving
+    other requests during the download. An interrupted download leaves a
+    .part file which is resumed with a Range request on the next call.
+    
+    The sha256 is computed while streaming; if the catalog has a digest
+    the file is only moved into place when it matches.
+    
+    Returns:
+        Path of the downloaded file
+    """
+    models_dir = Path(settings.MODELS_DIR)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    
+    suffix = Path(urlparse(model.download_url).path).suffix or ".pt"
+    target = models_dir / f"{model.id}{suffix}"
+    partial = target.with_name(target.name + ".part")
+    
+    # Reuse an existing file only if it verifies
+    if target.exists() and model.sha256:
+        existing = await asyncio.to_thread(_sha256_file, target)
+        if existing.hexdigest() == model.sha256:
+            return str(target)
+    
+    offset = partial.stat().st_size if partial.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    
+    timeout = httpx.Timeout(30.0, read=None)
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        async with client.stream("GET", model.download_url, headers=headers) as response:
+            if response.status_code == 416:
+                # Stale .part that the server can't resume - start over next time
+                partial.unlink(missing_ok=True)
+            response.raise_for_status()
+            
+            # Only direct file URLs can be downloaded; a repo/landing page
+            # would otherwise be saved as the weights file
+            content_type = response.headers.get("content-type", "")
+            if content_type.startswith("text/html"):
+                raise NotAModelFile(
+                    f"{model.download_url} is a web page ({content_type}), not a model file"
+                )
+            
+            # 206 = server honoured the Range header, otherwise restart from 0
+            resumed = response.status_code == 206
+            digest = await asyncio.to_thread(_sha256_file, partial) if resumed else hashlib.sha256()
+            async with aiofiles.open(partial, "ab" if resumed else "wb") as f:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    await f.write(chunk)
+    
+    sha256 = digest.hexdigest()
+    if model.sha256 and sha256 != model.sha256:
+        partial.unlink(missing_ok=True)
+        raise ChecksumMismatch(f"sha256 {sha256} != expected {model.sha256}")
+    
+    model.sha256 = sha256
+    partial.replace(target)
+    logger.info(f"Downloaded model '{model.id}' to {target}")
+    return str(target)
+
+
+async def _fetch_model(model: ModelInfo) -> ModelInfo:
+    """
+    Make a catalog model available locally.
+    Models with a download_url are streamed, bundled ones are only marked.
+    """
+    lock = _download_locks.setdefault(model.id, asyncio.Lock())
+    async with lock:
+        # A concurrent request may have finished the download while we waited
+        if model.downloaded:
+            return model
+        
+        if model.download_url:
+            model.file_path = await _download_weights(model)
+        else:
+            model.file_path = f"/models/{model.id}.pt"
+        model.downloaded = True
+        _invalidate_catalog()
+        return model
+
 
 @router.get("/available")
-async def get_available_models():
+async def get_available_models(request: Request, response: Response):
     """
     List all available models
     
-    Returns list of models with download status, specs, and metadata
+    Returns list of models with download status, specs, and metadata.
+    Sends an ETag; clients revalidating with If-None-Match get 304 until
+    a model is downloaded or deleted.
     """
-    models = list(storage.models_catalog.values())
+    etag = f'W/"models-{_catalog_version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    models = list(_catalog_snapshot().values())
     
     return {
         "success": True,
-        "models": [m.model_dump() for m in models],
+        "models": models,
         "total_models": len(models)
     }
 
@@ -35,8 +187,8 @@ async def download_model(id: str):
     Path Params:
     - id: Model ID (e.g., yolo11s, yolo11m, depth-anything)
     
-    Note: This is a dummy implementation. In production, this would
-    actually download the model file from the download_url.
+    Models with a download_url are streamed to MODELS_DIR; bundled models
+    (no URL) are only marked as downloaded.
     """
     if id not in storage.models_catalog:
         raise HTTPException(status_code=404, detail=f"Model '{id}' not found in catalog")
@@ -50,9 +202,11 @@ async def download_model(id: str):
             "model": model.model_dump()
         }
     
-    # Simulate download by updating the model
-    model.downloaded = True
-    model.file_path = f"/models/{id}.pt"
+    try:
+        await _fetch_model(model)
+    except (httpx.HTTPError, ChecksumMismatch, NotAModelFile) as e:
+        logger.error(f"Model download failed for '{id}': {e}")
+        raise HTTPException(status_code=502, detail=f"Failed to download model '{id}': {e}")
     
     return {
         "success": True,
@@ -78,11 +232,9 @@ async def get_model_info(id: str):
     if id not in storage.models_catalog:
         raise HTTPException(status_code=404, detail=f"Model '{id}' not found")
     
-    model = storage.models_catalog[id]
-    
     return {
         "success": True,
-        "model": model.model_dump()
+        "model": _catalog_snapshot()[id]
     }
 
 
@@ -110,6 +262,7 @@ async def delete_model(id: str):
     # Mark as not downloaded
     model.downloaded = False
     model.file_path = None
+    _invalidate_catalog()
     
     return {
         "success": True,
@@ -125,21 +278,22 @@ async def download_all_models():
     Downloads all models marked as essential for ADAS operation
     """
     essential_models = ["yolo11n", "mediapipe-face"]
+    failed = [m for m in essential_models if m not in storage.models_catalog]
+    to_fetch = [m for m in essential_models if m in storage.models_catalog]
+    
+    # Downloads are network-bound and independent - run them concurrently
+    results = await asyncio.gather(
+        *(_fetch_model(storage.models_catalog[m]) for m in to_fetch),
+        return_exceptions=True
+    )
+    
     downloaded = []
-    failed = []
-    
-    for model_id in essential_models:
-        if model_id in storage.models_catalog:
-            model = storage.models_catalog[model_id]
-            if not model.downloaded:
-                # Simulate download
-                model.downloaded = True
-                model.file_path = f"/models/{model_id}.pt"
-                downloaded.append(model_id)
-            else:
-                downloaded.append(model_id)  # Already downloaded
-        else:
+    for model_id, result in zip(to_fetch, results):
+        if isinstance(result, Exception):
+            logger.error(f"Model download failed for '{model_id}': {result}")
             failed.append(model_id)
+        else:
+            downloaded.append(model_id)
     
     return {
         "success": True,
@@ -9,6 +9,7 @@ import uuid
 import random
 import base64
 
+from ..core.frames import read_frame
 from ..models import storage, StreamSession, StreamStartRequest, StreamStopRequest, StreamStatus
 
 router = APIRouter(prefix="/api/stream", tags=["streaming"])
@@ -82,11 +83,10 @@ async def poll_stream(session_id: str):
     
     Frontend should poll this endpoint every 100-200ms
     """
-    if session_id not in storage.stream_sessions:
+    session = storage.stream_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
     
-    session = storage.stream_sessions[session_id]
-    
     # Update frame count
     session.frame_count += 1
     
@@ -125,7 +125,8 @@ async def poll_stream(session_id: str):
 @router.post("/frame")
 async def process_frame(
     session_id: str = Form(...),
-    frame: str = Form(...),
+    frame: Optional[str] = Form(None),
+    frame_file: Optional[UploadFile] = File(None),
     timestamp: Optional[float] = Form(None)
 ):
     """
@@ -133,17 +134,24 @@ async def process_frame(
     
     FormData:
     - session_id: Session ID from /api/stream/start
-    - frame: Base64 encoded image or binary data
+    - frame: Base64 encoded image (legacy clients)
+    - frame_file: Raw JPEG/WebP bytes as a binary file part (preferred,
+      skips the ~33% base64 overhead)
     - timestamp: Frame timestamp
     
+    One of frame / frame_file is required.
+    
     Returns:
     - detections: Detected objects in the frame
     - latency_ms: Processing time
     """
-    if session_id not in storage.stream_sessions:
+    session = storage.stream_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
     
-    session = storage.stream_sessions[session_id]
+    image = await read_frame(frame, frame_file)
+    height, width = image.shape[:2]
+    
     session.frame_count += 1
     
     # Generate dummy detections
@@ -152,16 +160,14 @@ async def process_frame(
     
     classes = ["car", "person", "motorcycle", "truck", "bicycle"]
     
+    # Dummy boxes, kept inside the decoded frame
     for i in range(num_detections):
+        x1, x2 = sorted(random.sample(range(width + 1), 2))
+        y1, y2 = sorted(random.sample(range(height + 1), 2))
         detections.append({
             "class_name": random.choice(classes),
             "confidence": round(random.uniform(0.65, 0.96), 3),
-            "bbox": [
-                random.randint(50, 800),
-                random.randint(50, 400),
-                random.randint(900, 1400),
-                random.randint(500, 900)
-            ]
+            "bbox": [x1, y1, x2, y2]
         })
     
     latency_ms = round(random.uniform(12.0, 28.0), 1)
@@ -182,10 +188,10 @@ async def stop_stream(request: StreamStopRequest):
     Request body:
     - session_id: Session ID to stop
     """
-    if request.session_id not in storage.stream_sessions:
+    session = storage.stream_sessions.get(request.session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail=f"Session '{request.session_id}' not found")
     
-    session = storage.stream_sessions[request.session_id]
     session.status = StreamStatus.STOPPED
     
     return {
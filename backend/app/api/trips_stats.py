@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import random
 
 from ..models import storage, Trip, TripCreateRequest, TripCompleteRequest, TripStatus
+from ..core.responses import DefaultResponse
 
 router = APIRouter(prefix="/api", tags=["trips", "statistics"])
 
@@ -94,11 +95,11 @@ async def get_trips_list(
     end_idx = start_idx + limit
     paginated_trips = trips[start_idx:end_idx]
     
-    return {
+    return DefaultResponse({
         "success": True,
-        "trips": [t.model_dump() for t in paginated_trips],
+        "trips": [t.model_dump(mode="json") for t in paginated_trips],
         "total": total
-    }
+    })
 
 
 @router.get("/trips/{id}")
@@ -15,6 +15,42 @@ from app.core.config import settings
 
 router = APIRouter(prefix="/api", tags=["upload", "storage"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB chunks
+
+
+class UploadTooLarge(Exception):
+    """Raised when a streamed upload exceeds its size limit"""
+    
+    def __init__(self, size_bytes: int):
+        super().__init__(size_bytes)
+        self.size_bytes = size_bytes
+
+
+async def _stream_to_disk(file: UploadFile, file_path: Path, max_bytes: int) -> int:
+    """
+    Copy an upload to disk in chunks instead of reading the whole body
+    into memory. The partial file is removed if the limit is exceeded.
+    
+    Returns:
+        Number of bytes written
+    """
+    written = 0
+    try:
+        async with aiofiles.open(file_path, 'wb') as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise UploadTooLarge(written)
+                await f.write(chunk)
+    except BaseException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return written
+
+
 
 @router.post("/upload/image")
 async def upload_image(
@@ -38,15 +74,11 @@ async def upload_image(
             detail="File must be an image (jpg, png, etc.)"
         )
     
-    # Read file
-    content = await file.read()
-    file_size_mb = len(content) / (1024 * 1024)
-    
-    # Check file size (max 50MB for images)
-    if file_size_mb > 50:
+    # Check file size (max 50MB for images) up front when the client sent it
+    if file.size is not None and file.size > 50 * 1024 * 1024:
         raise HTTPException(
             status_code=400,
-            detail=f"Image too large ({file_size_mb:.1f}MB). Maximum is 50MB."
+            detail=f"Image too large ({file.size / (1024 * 1024):.1f}MB). Maximum is 50MB."
         )
     
     # Create storage directory
@@ -64,9 +96,15 @@ async def upload_image(
     
     file_path = storage_dir / new_filename
     
-    # Save file asynchronously
-    async with aiofiles.open(file_path, 'wb') as f:
-        await f.write(content)
+    # Save file asynchronously (streamed, size enforced while writing)
+    try:
+        file_size = await _stream_to_disk(file, file_path, 50 * 1024 * 1024)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Image too large ({e.size_bytes / (1024 * 1024):.1f}MB+). Maximum is 50MB."
+        )
+    file_size_mb = file_size / (1024 * 1024)
     
     # Generate URL using configured base URL (supports both dev and production)
     url = f"{settings.API_BASE_URL}/api/files/images/{year_month}/{new_filename}"
@@ -100,15 +138,11 @@ async def upload_batch(
     
     for file in files:
         try:
-            # Read file
-            content = await file.read()
-            file_size_mb = len(content) / (1024 * 1024)
-            
-            # Check file size (max 500MB per file)
-            if file_size_mb > 500:
+            # Check file size (max 500MB per file) up front when known
+            if file.size is not None and file.size > 500 * 1024 * 1024:
                 failed.append({
                     "filename": file.filename,
-                    "error": f"File too large ({file_size_mb:.1f}MB). Maximum is 500MB."
+                    "error": f"File too large ({file.size / (1024 * 1024):.1f}MB). Maximum is 500MB."
                 })
                 continue
             
@@ -140,9 +174,16 @@ async def upload_batch(
             
             file_path = storage_dir / new_filename
             
-            # Save file asynchronously
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
+            # Save file asynchronously (streamed, size enforced while writing)
+            try:
+                file_size = await _stream_to_disk(file, file_path, 500 * 1024 * 1024)
+            except UploadTooLarge as e:
+                failed.append({
+                    "filename": file.filename,
+                    "error": f"File too large ({e.size_bytes / (1024 * 1024):.1f}MB+). Maximum is 500MB."
+                })
+                continue
+            file_size_mb = file_size / (1024 * 1024)
             
             # Generate URL using configured base URL (supports both dev and production)
             url = f"{settings.API_BASE_URL}/api/files/{file_type}/{year_month}/{new_filename}"
@@ -6,6 +6,7 @@ FastAPI routes for video upload and result retrieval.
 Endpoints:
 - POST /api/video/upload - Upload video for analysis
 - GET /api/video/result/{job_id} - Get analysis results
+- GET /api/video/job/{job_id}/events - Stream job safety events (NDJSON)
 - GET /api/video/download/{job_id}/{filename} - Download result video
 
 Author: Senior ADAS Engineer
@@ -13,14 +14,18 @@ Date: 2025-12-21 (Refactored for production)
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import json
 import logging
+import time
+import uuid
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, async_session_maker
 from app.services.video_service import VideoService
 from app.services.job_service import get_job_service
 from app.schemas.video import VideoJobResponse, VideoJobCreate
@@ -56,8 +61,7 @@ async def upload_video(
         400: Invalid file, format, or size
         500: Server error during upload
     """
-    import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         logger.info(f"📤 Upload started: {file.filename} (type={video_type}, device={device})")
@@ -75,7 +79,7 @@ async def upload_video(
         # FAST validation (doesn't read entire file)
         logger.info(f"[Upload] Step 1/4: Validating format and size...")
         await video_service.validate_video(file)
-        logger.info(f"[Upload] ✓ Validation passed ({time.time() - start_time:.1f}s)")
+        logger.info(f"[Upload] ✓ Validation passed ({time.perf_counter() - start_time:.1f}s)")
         
         # Validate video type
         if video_type not in ["dashcam", "in_cabin"]:
@@ -89,52 +93,69 @@ async def upload_video(
             logger.warning(f"Invalid device '{device}', defaulting to 'cpu'")
             device = "cpu"
         
-        # Create job in database
-        logger.info(f"[Upload] Step 2/4: Creating job record...")
-        job = await video_service.create_job(
+        # Save uploaded file (streaming, hashed on the way)
+        logger.info(f"[Upload] Step 2/4: Uploading video (streaming)...")
+        upload = await video_service.save_uploaded_video(file)
+        upload_time = time.perf_counter() - start_time
+        logger.info(f"[Upload] ✓ Video uploaded ({upload_time:.1f}s)")
+        
+        # Create job in database (deduplicated on the content hash)
+        logger.info(f"[Upload] Step 3/4: Creating job record...")
+        job, video_path = await video_service.create_job(
             filename=file.filename,
+            upload=upload,
             video_type=video_type,
             device=device,
             user_id=1  # TODO: Get from authentication
         )
-        logger.info(f"[Upload] ✓ Job created: {job.job_id} ({time.time() - start_time:.1f}s)")
-        
-        # Save uploaded file (streaming)
-        logger.info(f"[Upload] Step 3/4: Uploading video (streaming)...")
-        await video_service.save_uploaded_video(job.job_id, file)
-        upload_time = time.time() - start_time
-        logger.info(f"[Upload] ✓ Video uploaded ({upload_time:.1f}s)")
+        logger.info(f"[Upload] ✓ Job created: {job.job_id} ({time.perf_counter() - start_time:.1f}s)")
         
         # Submit to background processing
         logger.info(f"[Upload] Step 4/4: Submitting for AI processing...")
-        # Submit to background processing
-        logger.info(f"[Upload] Step 4/4: Submitting for AI processing...")
-        job_service = get_job_service()
-        await job_service.submit_job(
-            session=db,
-            job_id=job.job_id,
-            input_path=job.video_path,
-            output_path=job.result_path,
-            video_type=video_type,
-            device=device
-        )
+        if settings.USE_GPU_WORKER:
+            # Job stays pending in job_queue; a GPU worker claims it
+            # (FOR UPDATE SKIP LOCKED), so inference never runs in this process
+            logger.info(f"[Upload] Job {job.job_id} queued for GPU worker")
+        else:
+            job_service = get_job_service()
+            await job_service.submit_job(
+                session=db,
+                job_id=job.job_id,
+                input_path=video_path,
+                output_path=job.result_path,
+                video_type=video_type,
+                device=device
+            )
         
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         logger.info(f"✅ Upload complete - Job {job.job_id} submitted (total: {total_time:.1f}s)")
         
-        return job
+        # JobQueue has no filename/path columns: fill them from the upload
+        return VideoJobResponse(
+            id=job.id,
+            job_id=str(job.job_id),
+            video_filename=file.filename,
+            video_path=video_path,
+            video_size_mb=round(upload.size_bytes / 1024 / 1024, 2),
+            status=job.status,
+            progress_percent=job.progress_percent,
+            result_path=job.result_path,
+            trip_id=job.trip_id,
+            created_at=job.created_at,
+            updated_at=job.updated_at
+        )
     
     except HTTPException:
         raise
     except ValidationError as e:
-        upload_time = time.time() - start_time
+        upload_time = time.perf_counter() - start_time
         logger.warning(f"⚠️ Upload validation failed after {upload_time:.1f}s: {e.message}")
         raise HTTPException(
             status_code=400, 
             detail=e.message
         )
     except Exception as e:
-        upload_time = time.time() - start_time
+        upload_time = time.perf_counter() - start_time
         logger.error(f"❌ Upload failed after {upload_time:.1f}s: {e}", exc_info=True)
         raise HTTPException(
             status_code=500, 
@@ -187,6 +208,56 @@ async def get_result(
         )
 
 
+@router.get("/job/{job_id}/events")
+async def stream_job_events(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream safety events of a job as NDJSON (one JSON object per line).
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory stays flat and the first line is sent immediately, even for
+    jobs with tens of thousands of events.
+    
+    Args:
+        job_id: Job ID from upload
+        db: Database session
+        
+    Returns:
+        application/x-ndjson stream of events
+    """
+    from sqlalchemy import select
+    from app.db.models.safety_event import SafetyEvent
+    from app.db.repositories.job_queue_repo import JobQueueRepository
+    
+    job = await JobQueueRepository(db).get_by_job_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    queue_id = job.id
+    
+    async def ndjson_lines():
+        # Own session: the request-scoped one is closed before the body streams
+        async with async_session_maker() as session:
+            events = await session.stream_scalars(
+                select(SafetyEvent)
+                .where(SafetyEvent.job_id == queue_id)
+                .order_by(SafetyEvent.frame_number, SafetyEvent.id)
+                .execution_options(yield_per=500)
+            )
+            async for e in events:
+                yield json.dumps({
+                    "type": e.event_type,
+                    "level": e.severity,
+                    "timestamp": e.timestamp.isoformat() if e.timestamp else None,
+                    "frame": e.frame_number,
+                    "description": e.description,
+                    "data": e.meta_data
+                }, default=str) + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.get("/download/{job_id}/{filename}")
 async def download_result(
     job_id: str,
@@ -274,12 +345,10 @@ async def delete_job(
         
         # Cleanup files
         video_service = VideoService(db)
+        # The raw video is content-addressed and may back other jobs, so only
+        # this job's result is removed
         try:
-            input_path = Path(job.video_path) if job.video_path else None
-            if input_path and input_path.exists():
-                input_path.unlink()
-            
-            output_path_str = video_service.get_output_path(job.job_id)
+            output_path_str = job.result_path or video_service.get_output_path(job.job_id)
             output_path = Path(output_path_str)
             if output_path.exists():
                 output_path.unlink()
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import random
 
 from ..models import storage, Video, VideoStatus
+from ..core.responses import DefaultResponse
 
 router = APIRouter(prefix="/api", tags=["videos"])
 
@@ -61,11 +62,12 @@ async def get_videos_list(
             "status": v.status.value
         })
     
-    return {
+    # Rows are already plain JSON types: skip the jsonable_encoder walk
+    return DefaultResponse({
         "success": True,
         "videos": response_videos,
         "total": total
-    }
+    })
 
 
 @router.get("/videos/{id}")
@@ -115,7 +117,7 @@ async def delete_video(id: int):
         storage.datasets.pop(id)
     
     # Remove associated detections
-    storage.detections = [d for d in storage.detections if d.video_id != id]
+    storage.detections.remove_video(id)
     
     return {
         "success": True,
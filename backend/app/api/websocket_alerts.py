@@ -39,18 +39,45 @@ from typing import List, Dict, Any, Set, Optional
 import logging
 import json
 import asyncio
+import contextlib
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 
 
+def _dumps(message: Dict[str, Any]) -> str:
+    """
+    Serialize a message to the JSON text frame clients receive.
+    
+    Alerts are encoded once per broadcast and the same text is sent to
+    every client. orjson also takes numpy scalars from the perception
+    modules as-is; stdlib json is the fallback.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            message,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for alert streaming.
     """
     
+    # A client that cannot take an alert within this many seconds is
+    # dropped instead of stalling the broadcast for everyone else
+    SEND_TIMEOUT = 2.0
+    
     def __init__(self):
         # Active WebSocket connections
         self.active_connections: Set[WebSocket] = set()
@@ -81,7 +108,7 @@ class ConnectionManager:
     async def send_alert(self, alert: Dict[str, Any], websocket: WebSocket):
         """Send alert to specific client."""
         try:
-            await websocket.send_json(alert)
+            await websocket.send_text(_dumps(alert))
         except Exception as e:
             logger.error(f"Error sending alert to client: {e}")
             self.disconnect(websocket)
@@ -96,19 +123,26 @@ class ConnectionManager:
         if not self.active_connections:
             return
         
-        # Add to queue for broadcast
+        # Add to queue for broadcast (never block the producer: when the
+        # broadcaster falls behind, stale alerts are dropped instead)
         try:
-            await self.alert_queue.put(alert)
+            self.alert_queue.put_nowait(alert)
         except asyncio.QueueFull:
             logger.warning("Alert queue full, dropping oldest alert")
             # Remove oldest and add new
             try:
                 self.alert_queue.get_nowait()
-                await self.alert_queue.put(alert)
-            except Exception:
+                self.alert_queue.task_done()
+                self.alert_queue.put_nowait(alert)
+            except (asyncio.QueueEmpty, asyncio.QueueFull):
                 # Ignore queue errors during alert buffering
                 pass
     
+    async def _close(self, websocket: WebSocket):
+        """Close a dropped client's socket; it may already be gone or stuck."""
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(websocket.close(code=1011), self.SEND_TIMEOUT)
+    
     async def _broadcast_loop(self):
         """Background task to broadcast alerts from queue."""
         logger.info("Alert broadcast loop started")
@@ -118,18 +152,32 @@ class ConnectionManager:
                 # Wait for alert
                 alert = await self.alert_queue.get()
                 
-                # Broadcast to all connections
-                disconnected = set()
-                for connection in self.active_connections:
-                    try:
-                        await connection.send_json(alert)
-                    except Exception as e:
-                        logger.error(f"Failed to send alert: {e}")
-                        disconnected.add(connection)
+                # Broadcast to all connections concurrently, so one slow
+                # client does not hold the alert back from the others
+                connections = list(self.active_connections)
+                text = _dumps(alert)
+                results = await asyncio.gather(
+                    *(
+                        asyncio.wait_for(connection.send_text(text), self.SEND_TIMEOUT)
+                        for connection in connections
+                    ),
+                    return_exceptions=True
+                )
                 
-                # Remove disconnected clients
-                for conn in disconnected:
+                # Remove and close disconnected (or too slow) clients
+                dropped = []
+                for conn, result in zip(connections, results):
+                    if isinstance(result, asyncio.TimeoutError):
+                        logger.warning(f"Alert send timed out after {self.SEND_TIMEOUT}s, dropping client")
+                    elif isinstance(result, Exception):
+                        logger.error(f"Failed to send alert: {result!r}")
+                    else:
+                        continue
                     self.disconnect(conn)
+                    dropped.append(conn)
+                
+                if dropped:
+                    await asyncio.gather(*(self._close(conn) for conn in dropped))
                 
                 self.alert_queue.task_done()
                 
@@ -143,10 +191,10 @@ class ConnectionManager:
     async def send_heartbeat(self, websocket: WebSocket):
         """Send heartbeat to keep connection alive."""
         try:
-            await websocket.send_json({
+            await websocket.send_text(_dumps({
                 "type": "heartbeat",
                 "timestamp": datetime.utcnow().isoformat()
-            })
+            }))
         except Exception:
             # Ignore heartbeat send errors (connection may be closed)
             pass
@@ -221,10 +269,12 @@ async def websocket_alerts_endpoint(websocket: WebSocket):
                 await manager.send_heartbeat(websocket)
             
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
         logger.info("Client disconnected normally")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
+    finally:
+        # Also runs on cancellation (server shutdown, client task killed),
+        # which the except clauses above don't see
         manager.disconnect(websocket)
 
 
@@ -0,0 +1,25 @@
+"""
+CLOCK
+=====
+Wall-clock timestamps for the in-memory API records.
+
+Record timestamps (chat messages, detections, uploads, users) only need
+second resolution, so the ISO string is formatted once per second and
+reused for every write within that second.
+"""
+
+import time
+from datetime import datetime
+
+# (epoch second, ISO string for it); swapped as one tuple so readers never
+# see a second paired with another second's string
+_cached = (0, "")
+
+
+def now_iso() -> str:
+    """Local time as an ISO 8601 string, truncated to the second."""
+    global _cached
+    second = int(time.time())
+    if second != _cached[0]:
+        _cached = (second, datetime.fromtimestamp(second).isoformat())
+    return _cached[1]
@@ -41,8 +41,8 @@ class Settings(BaseSettings):
     PG_NAME: str = "adas_db"  # Database created
     PG_USER: str = os.getenv("USER", "postgres")  # Current macOS user
     PG_PASSWORD: str = ""
-    DB_POOL_SIZE: int = 10
-    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_SIZE: int = 20  # Persistent connections kept warm for request handlers
+    DB_MAX_OVERFLOW: int = 10  # Burst connections (closed on return, so keep small)
     DB_ECHO: bool = False  # Set True for SQL query logging
     
     # v3.0 Storage Paths (production: /hdd3/adas/)
@@ -67,11 +67,19 @@ class Settings(BaseSettings):
     # AI Models
     YOLO_MODEL_PATH: str = "./backend/models/yolov11n.pt"
     MEDIAPIPE_MODEL_PATH: str = "./backend/models"
+    MODELS_DIR: str = "./backend/models"  # Target dir for /api/models downloads
     DEFAULT_DEVICE: str = "cpu"  # cpu or cuda
+    # Load and warm the DEFAULT_DEVICE pipelines at startup instead of on
+    # the first job (comma-separated video types, empty to disable)
+    PRELOAD_VIDEO_TYPES: str = "dashcam"
     
     # Processing Configuration
     MAX_VIDEO_SIZE_MB: int = 1024  # 1GB - Server mạnh, GPU T4 16GB VRAM
     MAX_CONCURRENT_JOBS: int = 2
+    # True: /api/video/upload only queues the job; supervisor-managed
+    # workers/gpu_worker.py processes (models stay loaded there). False:
+    # run the job in this API process (JobService thread pool).
+    USE_GPU_WORKER: bool = False
     VIDEO_CHUNK_SIZE_MB: int = 10
     
     # Logging
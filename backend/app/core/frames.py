@@ -0,0 +1,72 @@
+"""
+FRAMES
+======
+Decoding of single camera frames posted to the polling endpoints.
+
+Clients send either a binary file part (JPEG/PNG/WebP bytes) or, for
+legacy clients, the same image base64-encoded in a form field.
+"""
+
+import asyncio
+import base64
+import binascii
+from typing import Optional
+
+import cv2
+import numpy as np
+from fastapi import HTTPException, UploadFile
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    Decode encoded image bytes to a BGR frame.
+
+    Raises:
+        ValueError: If the bytes are not a decodable image
+    """
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("not a decodable image")
+    return frame
+
+
+async def read_frame(
+    frame: Optional[str],
+    frame_file: Optional[UploadFile]
+) -> np.ndarray:
+    """
+    Read and decode the posted frame, preferring the binary part.
+
+    Args:
+        frame: Base64 image (optionally a data URL)
+        frame_file: Binary image part
+
+    Returns:
+        BGR frame
+
+    Raises:
+        HTTPException: 422 if neither is given, 400 if the image is invalid
+    """
+    if frame_file is not None:
+        data = await frame_file.read()
+    elif frame is not None:
+        # Strip a "data:image/jpeg;base64," prefix if present
+        _, _, payload = frame.rpartition(",")
+        try:
+            data = base64.b64decode(payload, validate=True)
+        except (binascii.Error, ValueError):
+            raise HTTPException(status_code=400, detail="'frame' is not valid base64")
+    else:
+        raise HTTPException(
+            status_code=422,
+            detail="Either 'frame' (base64) or 'frame_file' (binary) is required"
+        )
+
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty frame")
+
+    try:
+        # JPEG decode is CPU-bound: keep it off the event loop
+        return await asyncio.to_thread(decode_image, data)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Frame is not a valid image")
@@ -0,0 +1,21 @@
+"""
+RESPONSE CLASSES
+================
+JSON response class shared by the app and by handlers that build their
+response directly.
+
+orjson renders large event/detection payloads several times faster than
+stdlib json (and handles numpy scalars); falls back if it isn't installed.
+
+Returning DefaultResponse(...) from a handler also skips FastAPI's
+jsonable_encoder walk over the payload, so it is used for list/stat
+endpoints whose content is already plain JSON types.
+"""
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
@@ -5,6 +5,7 @@ Represents detected safety events (lane departure, collision warning, etc.).
 """
 
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -59,8 +60,8 @@ class SafetyEvent(Base):
     location_lng = Column(Float, nullable=True)
     speed_kmh = Column(Float, nullable=True)
     
-    # Metadata (JSON string)
-    meta_data = Column(Text, nullable=True)
+    # Metadata (JSONB: pass dicts, stored parsed and GIN-indexable)
+    meta_data = Column(JSONB, nullable=True)
     snapshot_path = Column(String(500), nullable=True)
     
     # Timestamps
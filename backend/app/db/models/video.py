@@ -19,6 +19,7 @@ class Video(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     sha256_hash = Column(String(64), unique=True, nullable=False, index=True)
+    head_sha256 = Column(String(64), index=True)  # SHA256 of the first MiB (early dedup)
     original_filename = Column(String(255), nullable=False)
     storage_path = Column(String(500), nullable=False)
     size_bytes = Column(BigInteger, nullable=False)
@@ -125,8 +125,9 @@ class JobQueueRepository(BaseRepository[JobQueue]):
                 setattr(job, key, value)
         
         job.updated_at = datetime.utcnow()
+        # Sessions keep attributes across commit (expire_on_commit=False)
+        # and every changed column is set here, so no refresh SELECT
         await self.session.commit()
-        await self.session.refresh(job)
         return job
     
     async def delete(self, job_id: int) -> bool:
@@ -178,7 +179,6 @@ class JobQueueRepository(BaseRepository[JobQueue]):
         job.updated_at = datetime.utcnow()
         
         await self.session.commit()
-        await self.session.refresh(job)
         return job
     
     async def update_progress(
@@ -198,7 +198,6 @@ class JobQueueRepository(BaseRepository[JobQueue]):
         job.updated_at = datetime.utcnow()
         
         await self.session.commit()
-        await self.session.refresh(job)
         return job
     
     async def mark_completed(
@@ -220,7 +219,6 @@ class JobQueueRepository(BaseRepository[JobQueue]):
         job.updated_at = datetime.utcnow()
         
         await self.session.commit()
-        await self.session.refresh(job)
         return job
     
     async def mark_failed(
@@ -239,7 +237,6 @@ class JobQueueRepository(BaseRepository[JobQueue]):
         job.attempts += 1
         
         await self.session.commit()
-        await self.session.refresh(job)
         return job
     
     async def cleanup_old_jobs(self, days: int = 90) -> int:
@@ -5,7 +5,7 @@ Data access layer for safety events.
 """
 
 from typing import Optional, List
-from sqlalchemy import select, desc, and_, func
+from sqlalchemy import select, desc, and_, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
@@ -42,6 +42,16 @@ class SafetyEventRepository(BaseRepository[SafetyEvent]):
             **kwargs
         )
     
+    async def create_many(self, rows: List[dict]) -> int:
+        """
+        Bulk insert events in one executemany round-trip.
+        Does not commit - the caller owns the transaction.
+        """
+        if not rows:
+            return 0
+        await self.session.execute(insert(SafetyEvent), rows)
+        return len(rows)
+    
     async def get_by_trip(
         self,
         trip_id: int,
@@ -5,6 +5,8 @@ Native async PostgreSQL with asyncpg driver.
 """
 
 import asyncio
+import functools
+import json
 import logging
 from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
@@ -56,6 +58,8 @@ async def init_db():
             pool_timeout=30,
             pool_recycle=3600,
             pool_pre_ping=True,
+            # JSONB columns: numpy scalars etc. in event metadata fall back to str
+            json_serializer=functools.partial(json.dumps, default=str),
         )
         
         _async_session_factory = async_sessionmaker(
@@ -99,6 +103,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     if not _async_session_factory:
         raise RuntimeError("PostgreSQL not initialized. Call init_db() first.")
     
+    # One pooled AsyncSession per request; `async with` returns the
+    # connection to the pool on exit, no separate close() round-trip.
     async with _async_session_factory() as session:
         try:
             yield session
@@ -106,8 +112,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 @asynccontextmanager
@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 sync_engine = create_engine(
     settings.database_url,  # Use sync URL
     echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=3600,
     pool_pre_ping=True,
 )
 
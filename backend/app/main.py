@@ -17,7 +17,9 @@ Date: 2026-01-03
 from fastapi import FastAPI, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 from pathlib import Path
 import sys
 
@@ -27,6 +29,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import core configuration
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.responses import DefaultResponse
 from app.db.session import init_db, close_db
 from app.services.job_service import get_job_service
 
@@ -75,6 +78,25 @@ async def lifespan(app: FastAPI):
     job_service = get_job_service()
     logger.info(f"✓ Job service initialized with {settings.MAX_CONCURRENT_JOBS} workers")
     
+    # Load model weights before the first upload rather than during it
+    # (jobs run in gpu_worker processes when USE_GPU_WORKER is set)
+    preload_types = tuple(
+        t.strip() for t in settings.PRELOAD_VIDEO_TYPES.split(",") if t.strip()
+    )
+    if preload_types and not settings.USE_GPU_WORKER:
+        logger.info(f"Preloading perception models ({', '.join(preload_types)})...")
+        try:
+            from perception.pipeline.video_pipeline_v11 import preload_pipelines
+            await asyncio.get_running_loop().run_in_executor(
+                job_service.executor,
+                preload_pipelines,
+                settings.DEFAULT_DEVICE,
+                preload_types
+            )
+            logger.info("✓ Perception models loaded")
+        except Exception as e:
+            logger.warning(f"✗ Model preload failed, loading on first job instead: {e}")
+    
     logger.info("Perception modules ready")
     logger.info("Storage directories configured")
     logger.info(f"API Documentation: http://{settings.HOST}:{settings.PORT}/docs")
@@ -172,6 +194,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
     # 🔧 CRITICAL FIX: Tell Swagger UI the correct server URL for Cloudflare
     servers=[
         {
@@ -338,10 +361,7 @@ async def debug_upload_test(file: UploadFile = File(...)):
     2. Cloudflare timeout behavior
     3. File upload configuration
     """
-    import time
-    from fastapi import UploadFile, File
-    
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Read file metadata only (don't save to disk)
@@ -353,7 +373,7 @@ async def debug_upload_test(file: UploadFile = File(...)):
         file_size_sample = len(chunk)
         
         # Calculate elapsed time
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         
         logger.info(f"🧪 Debug upload test: {filename} ({file_size_sample}+ bytes) in {elapsed:.2f}s")
         
@@ -372,7 +392,7 @@ async def debug_upload_test(file: UploadFile = File(...)):
         return {
             "status": "error",
             "message": str(e),
-            "elapsed_seconds": round(time.time() - start_time, 3)
+            "elapsed_seconds": round(time.perf_counter() - start_time, 3)
         }
 
 
@@ -3,11 +3,14 @@ Data models and in-memory storage for ADAS API
 This module contains Pydantic models and in-memory storage for testing
 """
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any, Literal
+from typing import List, Optional, Dict, Any, Literal, Deque
+from collections import deque
 from datetime import datetime
 from enum import Enum
 import uuid
 
+import numpy as np
+
 
 # ============================================================================
 # ENUMS
@@ -202,6 +205,7 @@ class ModelInfo(BaseModel):
     downloaded: bool
     file_path: Optional[str] = None
     download_url: Optional[str] = None
+    sha256: Optional[str] = None  # Expected digest of the weights file, if known
     classes: Optional[List[str]] = None
     input_size: Optional[List[int]] = None
     metadata: Optional[Dict[str, Any]] = None
@@ -249,6 +253,163 @@ class StreamSession(BaseModel):
 # IN-MEMORY STORAGE
 # ============================================================================
 
+class DetectionStore:
+    """
+    Detections in insertion order, with the fields the dashboard aggregates
+    over kept as parallel NumPy columns (struct-of-arrays).
+    
+    class_name / camera_id are interned to int ids in first-seen order, so
+    stats are np.bincount passes over contiguous arrays instead of
+    attribute lookups on every Detection. The Detection objects are kept
+    for endpoints that return them.
+    """
+    
+    _INITIAL_CAPACITY = 1024
+    
+    def __init__(self, detections=()):
+        self._items: List[Detection] = []
+        self._class_names: List[str] = []
+        self._class_index: Dict[str, int] = {}
+        self._camera_ids: List[str] = []
+        self._camera_index: Dict[str, int] = {}
+        self._class_col = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._camera_col = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._confidence_col = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+        # video_id per row (-1 = none), plus live rows per video so deleting
+        # a video without detections doesn't touch the columns at all
+        self._video_col = np.empty(self._INITIAL_CAPACITY, dtype=np.int64)
+        self._video_counts: Dict[int, int] = {}
+        for det in detections:
+            self.append(det)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def copy(self) -> List[Detection]:
+        return self._items.copy()
+    
+    @staticmethod
+    def _intern(value: str, names: List[str], index: Dict[str, int]) -> int:
+        idx = index.get(value)
+        if idx is None:
+            idx = index[value] = len(names)
+            names.append(value)
+        return idx
+    
+    def append(self, det: Detection):
+        n = len(self._items)
+        if n == len(self._class_col):
+            # Amortized O(1) growth
+            capacity = 2 * n
+            self._class_col = np.resize(self._class_col, capacity)
+            self._camera_col = np.resize(self._camera_col, capacity)
+            self._confidence_col = np.resize(self._confidence_col, capacity)
+            self._video_col = np.resize(self._video_col, capacity)
+        
+        self._class_col[n] = self._intern(det.class_name, self._class_names, self._class_index)
+        self._camera_col[n] = (
+            self._intern(det.camera_id, self._camera_ids, self._camera_index)
+            if det.camera_id else -1
+        )
+        self._confidence_col[n] = det.confidence
+        if det.video_id is None:
+            self._video_col[n] = -1
+        else:
+            self._video_col[n] = det.video_id
+            self._video_counts[det.video_id] = self._video_counts.get(det.video_id, 0) + 1
+        self._items.append(det)
+    
+    def remove_video(self, video_id: int) -> int:
+        """Drop all detections of a video. Returns count removed."""
+        removed = self._video_counts.pop(video_id, 0)
+        if not removed:
+            return 0
+        
+        # Compact every column with one mask instead of re-appending rows
+        n = len(self._items)
+        keep = self._video_col[:n] != video_id
+        kept = n - removed
+        for name in ("_class_col", "_camera_col", "_confidence_col", "_video_col"):
+            col = getattr(self, name)
+            col[:kept] = col[:n][keep]
+        items = self._items
+        self._items = [items[i] for i in np.flatnonzero(keep).tolist()]
+        
+        self._class_names, self._class_index = self._reintern(
+            self._class_col[:kept], self._class_names
+        )
+        self._camera_ids, self._camera_index = self._reintern(
+            self._camera_col[:kept], self._camera_ids
+        )
+        return removed
+    
+    @staticmethod
+    def _reintern(col: np.ndarray, names: List[str]):
+        """
+        Renumber interned ids (in place) to first-seen order of the rows left,
+        dropping names no row uses any more. -1 (no value) is left as is.
+        """
+        valid = col >= 0
+        ids, first = np.unique(col[valid], return_index=True)
+        order = ids[np.argsort(first)]
+        remap = np.full(len(names) + 1, -1, dtype=col.dtype)
+        remap[order] = np.arange(len(order), dtype=col.dtype)
+        col[valid] = remap[col[valid]]
+        new_names = [names[i] for i in order.tolist()]
+        return new_names, {name: i for i, name in enumerate(new_names)}
+    
+    def class_stats(self):
+        """
+        Per-class totals in first-seen order.
+        
+        Returns:
+            List of (class_name, count, confidence_sum)
+        """
+        n = len(self._items)
+        classes = self._class_col[:n]
+        counts = np.bincount(classes, minlength=len(self._class_names))
+        sums = np.bincount(classes, weights=self._confidence_col[:n], minlength=len(self._class_names))
+        return [
+            (name, count, confidence_sum)
+            for name, count, confidence_sum in zip(self._class_names, counts.tolist(), sums.tolist())
+            if count
+        ]
+    
+    def camera_counts(self):
+        """Detections per camera (cameras without an id skipped), first-seen order."""
+        cameras = self._camera_col[:len(self._items)]
+        counts = np.bincount(cameras[cameras >= 0], minlength=len(self._camera_ids))
+        return [
+            (camera_id, count)
+            for camera_id, count in zip(self._camera_ids, counts.tolist())
+            if count
+        ]
+    
+    def select(self, camera_id: Optional[str] = None, class_name: Optional[str] = None) -> List[Detection]:
+        """Detections matching the given camera/class (vectorized filter), in insertion order."""
+        if not camera_id and not class_name:
+            return self._items
+        
+        n = len(self._items)
+        mask = np.ones(n, dtype=bool)
+        if camera_id:
+            idx = self._camera_index.get(camera_id)
+            if idx is None:
+                return []
+            mask &= self._camera_col[:n] == idx
+        if class_name:
+            idx = self._class_index.get(class_name)
+            if idx is None:
+                return []
+            mask &= self._class_col[:n] == idx
+        
+        items = self._items
+        return [items[i] for i in np.flatnonzero(mask).tolist()]
+
+
 class InMemoryStorage:
     """In-memory storage for testing purposes"""
     
@@ -263,14 +424,17 @@ class InMemoryStorage:
         
         # Storage dictionaries
         self.datasets: Dict[int, DatasetItem] = {}
-        self.detections: List[Detection] = []
+        self.detections = DetectionStore()
         self.events: Dict[int, Event] = {}
         self.alerts: Dict[int, Alert] = {}
         self.trips: Dict[int, Trip] = {}
         self.videos: Dict[int, Video] = {}
         self.stream_sessions: Dict[str, StreamSession] = {}
         self.driver_status_history: List[Dict[str, Any]] = []
-        self.chat_history: List[Dict[str, Any]] = []
+        # Bounded: appending past maxlen drops the oldest message in O(1)
+        self.chat_history: Deque[Dict[str, Any]] = deque(maxlen=500)
+        # session_id -> that session's messages (same dicts as chat_history)
+        self.chat_by_session: Dict[str, Deque[Dict[str, Any]]] = {}
         
         # Models catalog
         self.models_catalog: Dict[str, ModelInfo] = {
@@ -387,7 +551,7 @@ class InMemoryStorage:
                 class_id=i % len(sample_classes),
                 confidence=0.75 + (i % 20) * 0.01,
                 bbox=[100 + i * 10, 200 + i * 5, 300 + i * 10, 400 + i * 5],
-                timestamp=(datetime.now() - timedelta(minutes=i * 5)).isoformat(),
+                timestamp=(datetime.now() - timedelta(minutes=i * 5)).isoformat(timespec="seconds"),
                 camera_id="cam_01",
                 video_id=1
             )
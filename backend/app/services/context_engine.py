@@ -46,6 +46,9 @@ class ContextEngine:
     Maintains rolling buffers and computes aggregate metrics.
     """
     
+    VEHICLE_CLASSES = frozenset({'car', 'truck', 'bus', 'motorcycle'})
+    PEDESTRIAN_CLASSES = frozenset({'person', 'bicycle'})
+    
     def __init__(
         self,
         window_seconds: float = 3.0,
@@ -115,25 +118,37 @@ class ContextEngine:
         Args:
             tracked_objects: List of tracked objects from distance_estimator process_tracked_object()
         """
-        # Count objects by type
-        vehicle_classes = {'car', 'truck', 'bus', 'motorcycle'}
-        pedestrian_classes = {'person', 'bicycle'}
-        
-        vehicle_count = sum(1 for obj in tracked_objects if obj.get('class_name') in vehicle_classes)
-        pedestrian_count = sum(1 for obj in tracked_objects if obj.get('class_name') in pedestrian_classes)
+        vehicle_classes = self.VEHICLE_CLASSES
+        pedestrian_classes = self.PEDESTRIAN_CLASSES
+        vehicle_count = 0
+        pedestrian_count = 0
+        critical_count = 0
+        min_distance = float('inf')
+        min_ttc = float('inf')
+        
+        # Counts and safety metrics in a single pass over the objects
+        for obj in tracked_objects:
+            class_name = obj.get('class_name')
+            if class_name in vehicle_classes:
+                vehicle_count += 1
+            elif class_name in pedestrian_classes:
+                pedestrian_count += 1
+            
+            distance = obj.get('distance')
+            if distance and distance < min_distance:
+                min_distance = distance
+            ttc = obj.get('ttc')
+            if ttc is not None and ttc < min_ttc:
+                min_ttc = ttc
+            if obj.get('risk_level') == 'CRITICAL':
+                critical_count += 1
         
         self.object_buffers['tracked_count'].append(len(tracked_objects))
         self.object_buffers['vehicle_count'].append(vehicle_count)
         self.object_buffers['pedestrian_count'].append(pedestrian_count)
-        
-        # Extract safety metrics
-        distances = [obj.get('distance', float('inf')) for obj in tracked_objects if obj.get('distance')]
-        ttcs = [obj.get('ttc') for obj in tracked_objects if obj.get('ttc') is not None]
-        critical_risks = [1 for obj in tracked_objects if obj.get('risk_level') == 'CRITICAL']
-        
-        self.object_buffers['min_distance'].append(min(distances) if distances else float('inf'))
-        self.object_buffers['min_ttc'].append(min(ttcs) if ttcs else float('inf'))
-        self.object_buffers['critical_risk_count'].append(sum(critical_risks))
+        self.object_buffers['min_distance'].append(min_distance)
+        self.object_buffers['min_ttc'].append(min_ttc)
+        self.object_buffers['critical_risk_count'].append(critical_count)
     
     def update_driver_context(self, driver_output: Dict[str, Any]) -> None:
         """
@@ -9,7 +9,7 @@ import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -86,7 +86,8 @@ class JobService:
             input_path,
             output_path,
             video_type,
-            device
+            device,
+            loop
         )
         
         # Store future
@@ -103,12 +104,15 @@ class JobService:
         input_path: str,
         output_path: str,
         video_type: str,
-        device: str
+        device: str,
+        loop: Optional[asyncio.AbstractEventLoop] = None
     ) -> Dict[str, Any]:
         """
         Synchronous video processing (runs in thread pool).
         
         This method BLOCKS and performs CPU-intensive AI processing.
+        Progress is pushed to the job record on `loop` so status polling
+        sees it while the video is still running.
         """
         logger.info(f"[Job {job_id}] 🎬 Starting video processing")
         logger.info(f"[Job {job_id}]   Input: {input_path}")
@@ -126,13 +130,27 @@ class JobService:
             from perception.pipeline.video_pipeline_v11 import process_video
             logger.info(f"[Job {job_id}] ✓ AI pipeline loaded")
             
+            # Report progress only when the whole percentage changes
+            last_percent = [-1]
+            
+            def report_progress(frame_idx: int, total_frames: int, event_count: int):
+                if loop is None or total_frames <= 0:
+                    return
+                percent = min(99, int(frame_idx * 100 / total_frames))
+                if percent > last_percent[0]:
+                    last_percent[0] = percent
+                    asyncio.run_coroutine_threadsafe(
+                        self._update_job_progress(job_id, percent), loop
+                    )
+            
             # Process video
             logger.info(f"[Job {job_id}] 🚀 Starting AI inference...")
             result = process_video(
                 input_path=input_path,
                 output_path=output_path,
                 video_type=video_type,
-                device=device
+                device=device,
+                progress_callback=report_progress
             )
             
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -243,6 +261,17 @@ class JobService:
                 logger.error(f"[Job {job_id}] Failed to update database: {e}")
                 await session.rollback()
     
+    async def _update_job_progress(self, job_id: str, progress_percent: int):
+        """Update job progress (scheduled from the processing thread)"""
+        from ..db.session import async_session_maker
+        
+        try:
+            async with async_session_maker() as session:
+                repo = JobQueueRepository(session)
+                await repo.update_progress(job_id, progress_percent)
+        except Exception as e:
+            logger.warning(f"[Job {job_id}] Failed to update progress: {e}")
+    
     async def _update_job_error(self, job_id: str, error: str):
         """Update job as failed"""
         from ..db.session import async_session_maker
@@ -284,24 +313,32 @@ class JobService:
         
         logger.info(f"[Job {job_id}] Storing {len(events)} events")
         
+        # Map event data to database schema
+        from ..db.models.safety_event import EventType, EventSeverity
+        
+        event_type_map = {
+            'lane_departure': EventType.LANE_DEPARTURE,
+            'collision_warning': EventType.COLLISION_WARNING,
+            'forward_collision': EventType.FORWARD_COLLISION,
+            'fatigue': EventType.DRIVER_FATIGUE,
+            'distraction': EventType.DRIVER_DISTRACTION,
+        }
+        
+        severity_map = {
+            'info': EventSeverity.INFO,
+            'warning': EventSeverity.WARNING,
+            'critical': EventSeverity.CRITICAL,
+        }
+        
+        # Event times are video offsets; resolve the local-time epoch once
+        # instead of a localtime() lookup per event
+        epoch = datetime.fromtimestamp(0)
+        
+        # Build plain rows, inserted with one bulk statement below
+        rows = []
         for event_data in events:
             try:
-                # Map event data to database schema
-                from ..db.models.safety_event import EventType, EventSeverity
-                
-                event_type_map = {
-                    'lane_departure': EventType.LANE_DEPARTURE,
-                    'collision_warning': EventType.COLLISION_WARNING,
-                    'forward_collision': EventType.FORWARD_COLLISION,
-                    'fatigue': EventType.DRIVER_FATIGUE,
-                    'distraction': EventType.DRIVER_DISTRACTION,
-                }
-                
-                severity_map = {
-                    'info': EventSeverity.INFO,
-                    'warning': EventSeverity.WARNING,
-                    'critical': EventSeverity.CRITICAL,
-                }
+                data = event_data.get('data', {})
                 
                 event_type_str = event_data.get('type', 'other')
                 event_type = event_type_map.get(event_type_str, EventType.OTHER)
@@ -310,26 +347,25 @@ class JobService:
                 severity = severity_map.get(severity_str, EventSeverity.WARNING)
                 
                 # Create timestamp from frame number
-                timestamp = datetime.fromtimestamp(
-                    event_data.get('time', 0)
-                )
+                timestamp = epoch + timedelta(seconds=event_data.get('time', 0))
                 
-                await event_repo.create_event(
-                    trip_id=job.trip_id,
-                    video_job_id=job.id,
-                    event_type=event_type,
-                    severity=severity,
-                    description=event_data.get('data', {}).get('message', 'Event detected'),
-                    risk_score=event_data.get('data', {}).get('risk', 0.5),
-                    timestamp=timestamp,
-                    frame_number=event_data.get('frame'),
-                    context_data=event_data.get('data')
-                )
+                rows.append({
+                    'trip_id': job.trip_id,
+                    'job_id': job.id,
+                    'event_type': event_type.value,
+                    'severity': severity.value,
+                    'description': data.get('message', 'Event detected'),
+                    'timestamp': timestamp,
+                    'frame_number': event_data.get('frame'),
+                    'meta_data': data
+                })
                 
             except Exception as e:
                 logger.error(f"Failed to store event: {e}")
                 continue
         
+        await event_repo.create_many(rows)
+        
         logger.info(f"[Job {job_id}] Stored events successfully")
     
     async def get_job_status(
@@ -4,10 +4,13 @@ Video Service
 Handles video upload, validation, and storage.
 """
 
+import asyncio
+import hashlib
 import os
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 import logging
 import aiofiles
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -23,16 +26,41 @@ from ..schemas.video import VideoJobCreate, VideoJobResponse
 
 logger = logging.getLogger(__name__)
 
+# Leading QuickTime/ISO-BMFF atom types (mp4/mov)
+_QT_ATOMS = frozenset({b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip', b'pnot'})
+_EBML_MAGIC = b'\x1a\x45\xdf\xa3'  # mkv/webm
+
+
+def has_video_signature(head: bytes) -> bool:
+    """Check the container magic bytes at the start of an upload."""
+    if head[4:8] in _QT_ATOMS:
+        return True
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return True
+    return head[:4] == _EBML_MAGIC
+
+
+@dataclass
+class StoredUpload:
+    """Upload streamed to a temp file, with the content hash taken on the way."""
+    path: Optional[Path]  # temp file under the raw video dir, None if already stored
+    size_bytes: int
+    sha256: str
+    head_sha256: str  # SHA256 of the first MiB
+
 
 class VideoService:
     """Service for video operations"""
     
     # Allowed video formats
-    ALLOWED_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+    ALLOWED_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
     
     # Max file size in bytes
     MAX_SIZE_BYTES = settings.MAX_VIDEO_SIZE_MB * 1024 * 1024
     
+    # Upload streaming block size
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+    
     def __init__(self, session: AsyncSession):
         """Initialize video service
         
@@ -75,7 +103,17 @@ class VideoService:
         ext = Path(filename).suffix.lower()
         if ext not in self.ALLOWED_EXTENSIONS:
             raise ValidationError(
-                f"Invalid video format. Allowed formats: {', '.join(self.ALLOWED_EXTENSIONS)}",
+                f"Invalid video format. Allowed formats: {', '.join(sorted(self.ALLOWED_EXTENSIONS))}",
+                details={"filename": filename, "extension": ext}
+            )
+        
+        # Check container magic bytes: a mislabeled file is rejected
+        # before anything is streamed to disk
+        head = await file.read(16)
+        await file.seek(0)
+        if not has_video_signature(head):
+            raise ValidationError(
+                "File content is not a recognized video container",
                 details={"filename": filename, "extension": ext}
             )
         
@@ -137,136 +175,171 @@ class VideoService:
     async def create_job(
         self,
         filename: str,
+        upload: StoredUpload,
         video_type: str = "dashcam",
         trip_id: Optional[int] = None,
         device: str = "cpu",
         user_id: Optional[int] = None
-    ) -> VideoJobResponse:
+    ) -> Tuple[JobQueue, str]:
         """
         Create a new video processing job.
         
+        The upload is deduplicated by its SHA256: a video already stored is
+        reused (upload_count is incremented and the temp copy, if any, is
+        dropped), otherwise the temp file is moved to its content-addressed
+        location once the Video and job rows are committed.
+        
         Args:
             filename: Video filename
+            upload: Uploaded file from save_uploaded_video()
             video_type: "dashcam" or "in_cabin"
             trip_id: Optional trip ID
             device: "cpu" or "cuda"
             user_id: Optional user ID
             
         Returns:
-            Created job
+            Tuple of (created job, stored video path)
         """
         # Generate job ID
         job_id_uuid = str(uuid.uuid4())
         
         # Prepare paths
-        input_path = str(self.raw_dir / f"{job_id_uuid}_{filename}")
-        output_path = str(self.processed_dir / f"{job_id_uuid}_result.mp4")
+        output_path = self.get_output_path(job_id_uuid)
         
-        # Create Video record first (required for foreign key)
+        # Get or create Video record first (required for foreign key)
         from app.db.models.video import Video
-        import hashlib
-        
-        # Generate SHA256 hash for video (using filename as placeholder for now)
-        # Will be updated with actual hash after file upload
-        temp_hash = hashlib.sha256(f"{job_id_uuid}_{filename}".encode()).hexdigest()
-        
-        video = Video(
-            sha256_hash=temp_hash,
-            original_filename=filename,
-            storage_path=input_path,
-            size_bytes=0,  # Will be updated after upload
-            uploader_id=user_id
-        )
-        self.session.add(video)
-        await self.session.flush()  # Get video.id without committing
-        
-        # Create job record with video_id
-        repo = JobQueueRepository(self.session)
-        job_data = {
-            "job_id": job_id_uuid,
-            "video_id": video.id,  # Required foreign key
-            "trip_id": trip_id,
-            "video_type": video_type,
-            "device": device,
-            "status": "pending",
-            "progress_percent": 0,
-        }
+        from sqlalchemy import update
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
         
         try:
-            job = await repo.create(**job_data)
-            await self.session.commit()  # Commit both video and job
-        except Exception as e:
-            logger.error(f"Failed to create job: {e}", exc_info=True)
-            await self.session.rollback()
-            raise ValidationError(
-                f"Failed to create job: {str(e)}",
-                details={"error": str(e)}
-            )
+            video_id = None
+            storage_path = None
+            if upload.path is not None:
+                storage_path = self.raw_dir / f"{upload.sha256}{upload.path.suffix}"
+                
+                # Insert-or-detect in one statement on the unique sha256_hash
+                # index, so two concurrent uploads of the same video cannot
+                # both pass a lookup and then collide on insert
+                result = await self.session.execute(
+                    pg_insert(Video)
+                    .values(
+                        sha256_hash=upload.sha256,
+                        head_sha256=upload.head_sha256,
+                        original_filename=filename,
+                        storage_path=str(storage_path),
+                        size_bytes=upload.size_bytes,
+                        uploader_id=user_id
+                    )
+                    .on_conflict_do_nothing(index_elements=[Video.sha256_hash])
+                    .returning(Video.id)
+                )
+                video_id = result.scalar_one_or_none()
+            
+            if video_id is None:
+                result = await self.session.execute(
+                    update(Video)
+                    .where(Video.sha256_hash == upload.sha256)
+                    .values(upload_count=Video.upload_count + 1)
+                    .returning(Video.id, Video.storage_path)
+                )
+                video_id, video_path = result.one()
+                storage_path = None  # Already stored: nothing to move
+                logger.info(f"Duplicate video detected: {upload.sha256[:8]}...")
+            else:
+                video_path = str(storage_path)
+            
+            # Create job record with video_id
+            repo = JobQueueRepository(self.session)
+            job_data = {
+                "job_id": job_id_uuid,
+                "video_id": video_id,  # Required foreign key
+                "trip_id": trip_id,
+                "video_type": video_type,
+                "device": device,
+                "status": "pending",
+                "progress_percent": 0,
+                "result_path": output_path,
+            }
+            
+            try:
+                job = await repo.create(**job_data)
+                await self.session.commit()  # Commit both video and job
+            except Exception as e:
+                logger.error(f"Failed to create job: {e}", exc_info=True)
+                await self.session.rollback()
+                raise ValidationError(
+                    f"Failed to create job: {str(e)}",
+                    details={"error": str(e)}
+                )
+            
+            # Only claim the content-addressed path once the rows exist, so a
+            # failed commit never leaves an unreferenced file behind.
+            # Same directory as the temp file: a rename, no data copy
+            if storage_path is not None:
+                upload.path.replace(storage_path)
+        finally:
+            # Duplicate (or failed) upload: drop the temp copy
+            if upload.path is not None:
+                upload.path.unlink(missing_ok=True)
         
         logger.info(f"Created job {job_id_uuid} for video: {filename}")
         
-        return job
+        return job, video_path
     
     async def save_uploaded_video(
         self,
-        job_id: str,
         file: 'UploadFile'
-    ) -> str:
+    ) -> StoredUpload:
         """
         Save uploaded video file using streaming to avoid blocking event loop.
         
+        The SHA256 is computed as the chunks arrive (off the event loop,
+        overlapped with the write), so the file is only touched once. An
+        upload identical to a stored video is detected up front and not
+        written at all (see find_duplicate_upload).
+        
         Args:
-            job_id: Job ID
             file: Uploaded video file
             
         Returns:
-            Path to saved file
+            Temp file (None for a duplicate), size and SHA256 of the upload
         """
-        repo = JobQueueRepository(self.session)
-        job = await repo.get_by_job_id(job_id)
-        
-        if not job:
-            raise ValidationError(f"Job {job_id} not found")
-        
-        # Get video record
-        from app.db.models.video import Video
-        from sqlalchemy import select
-        
-        result = await self.session.execute(
-            select(Video).where(Video.id == job.video_id)
-        )
-        video = result.scalar_one_or_none()
+        # Fingerprint of the first MiB: cheap pre-filter for duplicates
+        head = await file.read(self.UPLOAD_CHUNK_SIZE)
+        head_sha256 = (await asyncio.to_thread(hashlib.sha256, head)).hexdigest()
+        await file.seek(0)
+        
+        if file.size is not None:
+            sha256 = await self.find_duplicate_upload(file, head_sha256)
+            if sha256 is not None:
+                logger.info(f"[Upload] Already stored as {sha256[:8]}..., not writing it again")
+                return StoredUpload(
+                    path=None,
+                    size_bytes=file.size,
+                    sha256=sha256,
+                    head_sha256=head_sha256
+                )
         
-        # Generate unique filename
-        ext = Path(video.original_filename if video else "video.mp4").suffix
-        safe_filename = f"{job_id}{ext}"
-        input_path = self.raw_dir / safe_filename
+        ext = Path(file.filename or "video.mp4").suffix.lower() or ".mp4"
+        input_path = self.raw_dir / f".upload-{uuid.uuid4().hex}{ext}"
         
         # Stream file in chunks to avoid blocking event loop
         # CRITICAL: Validate size during streaming to catch oversized files early
-        CHUNK_SIZE = 1024 * 1024  # 1MB chunks
         file_size = 0
         max_size = self.MAX_SIZE_BYTES
+        digest = hashlib.sha256()
         
-        logger.info(f"[Job {job_id}] Starting streaming upload to {input_path} (max {settings.MAX_VIDEO_SIZE_MB}MB)")
+        logger.info(f"[Upload] Starting streaming upload to {input_path} (max {settings.MAX_VIDEO_SIZE_MB}MB)")
         
         try:
             # Save file asynchronously with chunked streaming
             async with aiofiles.open(input_path, 'wb') as f:
-                while True:
-                    chunk = await file.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    
+                while chunk := await file.read(self.UPLOAD_CHUNK_SIZE):
                     # Check size during streaming
                     file_size += len(chunk)
                     if file_size > max_size:
                         # Stop immediately if exceeding limit
-                        logger.warning(f"[Job {job_id}] File exceeded size limit during upload: {file_size / 1024 / 1024:.1f} MB")
-                        # Clean up partial file
-                        await f.close()
-                        if input_path.exists():
-                            input_path.unlink()
+                        logger.warning(f"[Upload] File exceeded size limit during upload: {file_size / 1024 / 1024:.1f} MB")
                         raise ValidationError(
                             f"File too large! Upload stopped at {file_size / 1024 / 1024:.1f} MB. Maximum: {settings.MAX_VIDEO_SIZE_MB} MB",
                             details={
@@ -275,39 +348,83 @@ class VideoService:
                             }
                         )
                     
-                    await f.write(chunk)
+                    # hashlib drops the GIL for large buffers: hash the 1 MiB
+                    # block in a thread while aiofiles writes it
+                    await asyncio.gather(
+                        asyncio.to_thread(digest.update, chunk),
+                        f.write(chunk),
+                    )
                     # Event loop can process other requests between chunks
                     
         except ValidationError:
-            raise  # Re-raise validation errors
+            # Clean up partial file
+            input_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
-            logger.error(f"[Job {job_id}] Upload failed: {e}", exc_info=True)
+            logger.error(f"[Upload] Upload failed: {e}", exc_info=True)
             # Clean up partial file
-            if input_path.exists():
-                input_path.unlink()
+            input_path.unlink(missing_ok=True)
             raise ValidationError(
                 f"Failed to save video: {str(e)}",
                 details={"error": str(e)}
             )
+        except BaseException:
+            # Client went away mid-stream (request task cancelled): don't
+            # leave the partial file behind
+            input_path.unlink(missing_ok=True)
+            raise
         
-        # Update job with input path
-        await repo.update(
-            job.id, 
-            video_path=str(input_path)
+        file_size_mb = file_size / (1024 * 1024)
+        logger.info(
+            f"[Upload] Saved video ({file_size_mb:.2f} MB) to {input_path}"
         )
         
-        # Update video record with actual file size
-        if video:
-            video.size_bytes = file_size
-            video.storage_path = str(input_path)
-            await self.session.commit()
+        return StoredUpload(
+            path=input_path,
+            size_bytes=file_size,
+            sha256=digest.hexdigest(),
+            head_sha256=head_sha256
+        )
+    
+    async def find_duplicate_upload(
+        self,
+        file: 'UploadFile',
+        head_sha256: str
+    ) -> Optional[str]:
+        """
+        SHA256 of an already stored video identical to the upload, or None.
         
-        file_size_mb = file_size / (1024 * 1024)
-        logger.info(
-            f"[Job {job_id}] Saved video ({file_size_mb:.2f} MB) to {input_path}"
+        Candidates are looked up by first-MiB hash and size (indexed). Only
+        if one exists is the rest of the upload hashed, read-only, to
+        confirm. Leaves the file at offset 0.
+        
+        Args:
+            file: Uploaded video file (size known)
+            head_sha256: SHA256 of its first MiB
+            
+        Returns:
+            Matching sha256_hash or None
+        """
+        from app.db.models.video import Video
+        from sqlalchemy import select
+        
+        result = await self.session.execute(
+            select(Video.sha256_hash).where(
+                Video.head_sha256 == head_sha256,
+                Video.size_bytes == file.size
+            )
         )
+        candidates = set(result.scalars())
+        if not candidates:
+            return None
+        
+        digest = hashlib.sha256()
+        while chunk := await file.read(self.UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(digest.update, chunk)
+        await file.seek(0)
         
-        return str(input_path)
+        sha256 = digest.hexdigest()
+        return sha256 if sha256 in candidates else None
     
     async def get_job(
         self,
@@ -22,7 +22,6 @@ Date: 2025-12-26 (Production Enhancement)
 import cv2
 import numpy as np
 from typing import Dict, Optional, Tuple, List
-from collections import deque
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,6 +43,9 @@ class DistanceEstimator:
         'person': {'height': 1.7, 'width': 0.5, 'length': 0.5}
     }
     
+    # Real height by class name, flattened for the per-frame batch path
+    VEHICLE_HEIGHTS = {name: dims['height'] for name, dims in VEHICLE_DIMENSIONS.items()}
+    
     # Risk thresholds (meters)
     SAFE_DISTANCE = 30.0
     CAUTION_DISTANCE = 15.0
@@ -56,9 +58,16 @@ class DistanceEstimator:
     DANGER_TTC = 1.5
     CRITICAL_TTC = 0.5
     
+    # Calibrated focal length (pixels) at full source resolution
+    DEFAULT_FOCAL_LENGTH = 700.0
+    
+    # Track history capacity (slots) and eviction age (frames)
+    MAX_TRACKS = 256
+    STALE_TRACK_FRAMES = 30
+    
     def __init__(
         self, 
-        focal_length: float = 700.0, 
+        focal_length: float = DEFAULT_FOCAL_LENGTH, 
         camera_height: float = 1.2,
         frame_rate: float = 30.0,
         pixel_to_meter: float = 0.02
@@ -77,9 +86,19 @@ class DistanceEstimator:
         self.frame_rate = frame_rate
         self.pixel_to_meter = pixel_to_meter
         
-        # Track history for velocity estimation
-        self.track_history = {}  # track_id -> deque of (distance, timestamp)
+        # Track history for velocity estimation (struct-of-arrays ring buffers)
+        # slot = _slot_of_id[track_id]; row `slot` holds that track's last
+        # max_history (distance, frame_number) samples
         self.max_history = 10
+        self._slot_of_id: Dict[int, int] = {}
+        self._free_slots = list(range(self.MAX_TRACKS - 1, -1, -1))
+        # float32/int32 keep a track's row at 40 bytes (one cache line);
+        # distances are clipped to 200 m so float32 loses nothing measurable
+        self._hist_distance = np.zeros((self.MAX_TRACKS, self.max_history), dtype=np.float32)
+        self._hist_frame = np.zeros((self.MAX_TRACKS, self.max_history), dtype=np.int32)
+        self._hist_len = np.zeros(self.MAX_TRACKS, dtype=np.int32)
+        self._hist_head = np.zeros(self.MAX_TRACKS, dtype=np.int32)
+        self._last_seen = np.zeros(self.MAX_TRACKS, dtype=np.int64)
         
         logger.info(
             f"DistanceEstimator initialized "
@@ -176,23 +195,6 @@ class DistanceEstimator:
         smoothed = np.mean(self.distance_history)
         return float(smoothed)
     
-    def classify_risk(self, distance: float) -> str:
-        """
-        Classify risk level based on distance.
-        
-        Args:
-            distance: Distance in meters
-            
-        Returns:
-            Risk level: "SAFE", "CAUTION", or "DANGER"
-        """
-        if distance > self.SAFE_DISTANCE:
-            return "SAFE"
-        elif distance > self.CAUTION_DISTANCE:
-            return "CAUTION"
-        else:
-            return "DANGER"
-    
     def estimate_velocity(
         self,
         track_id: int,
@@ -212,20 +214,27 @@ class DistanceEstimator:
             Positive = moving away, Negative = approaching
         """
         # Initialize history for new track
-        if track_id not in self.track_history:
-            self.track_history[track_id] = deque(maxlen=self.max_history)
+        slot = self._slot_of_id.get(track_id)
+        if slot is None:
+            slot = self._allocate_slot(track_id, frame_number)
         
-        # Add current measurement
-        self.track_history[track_id].append((distance, frame_number))
+        # Add current measurement (ring buffer write)
+        head = self._hist_head[slot]
+        self._hist_distance[slot, head] = distance
+        self._hist_frame[slot, head] = frame_number
+        self._hist_head[slot] = (head + 1) % self.max_history
+        self._hist_len[slot] = min(self._hist_len[slot] + 1, self.max_history)
+        self._last_seen[slot] = frame_number
         
-        history = self.track_history[track_id]
+        history_len = self._hist_len[slot]
         
-        if len(history) < 2:
+        if history_len < 2:
             return 0.0, 0.0
         
-        # Calculate velocity from last two measurements
-        dist_curr, frame_curr = history[-1]
-        dist_prev, frame_prev = history[-2]
+        # Calculate velocity from last two measurements (read back the
+        # stored float32 value so both ends of the difference match)
+        dist_curr, frame_curr = self._history_entry(slot, 1)
+        dist_prev, frame_prev = self._history_entry(slot, 2)
         
         # Time delta in seconds
         dt = (frame_curr - frame_prev) / self.frame_rate
@@ -238,8 +247,8 @@ class DistanceEstimator:
         
         # Calculate acceleration if we have enough history
         acceleration = 0.0
-        if len(history) >= 3:
-            dist_prev2, frame_prev2 = history[-3]
+        if history_len >= 3:
+            dist_prev2, frame_prev2 = self._history_entry(slot, 3)
             dt2 = (frame_prev - frame_prev2) / self.frame_rate
             
             if dt2 > 0:
@@ -248,6 +257,105 @@ class DistanceEstimator:
         
         return velocity, acceleration
     
+    def estimate_velocities(
+        self,
+        track_ids: List[int],
+        distances: np.ndarray,
+        frame_number: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized estimate_velocity() for all tracks seen in a frame: one
+        ring-buffer write and one velocity/acceleration pass over the
+        history arrays instead of a Python call per track.
+        
+        Args:
+            track_ids: Persistent track IDs, one per distance
+            distances: Current distances in meters, shape (N,)
+            frame_number: Current frame number
+            
+        Returns:
+            (relative velocities m/s, accelerations m/s^2), each shape (N,)
+        """
+        # Resolve slots in order, marking each as seen so a later
+        # allocation in this frame cannot evict it
+        slots = []
+        for track_id in track_ids:
+            slot = self._slot_of_id.get(track_id)
+            if slot is None:
+                slot = self._allocate_slot(track_id, frame_number)
+            self._last_seen[slot] = frame_number
+            slots.append(slot)
+        
+        if len(set(slots)) != len(slots):
+            # Same track twice in one frame: writes must happen in order
+            motion = np.array([
+                self.estimate_velocity(track_id, float(distance), frame_number)
+                for track_id, distance in zip(track_ids, distances)
+            ], dtype=np.float64).reshape(-1, 2)
+            return motion[:, 0], motion[:, 1]
+        
+        slots = np.array(slots, dtype=np.intp)
+        
+        # Add current measurements (ring buffer write)
+        head = self._hist_head[slots]
+        self._hist_distance[slots, head] = distances
+        self._hist_frame[slots, head] = frame_number
+        self._hist_head[slots] = (head + 1) % self.max_history
+        history_len = np.minimum(self._hist_len[slots] + 1, self.max_history)
+        self._hist_len[slots] = history_len
+        self._last_seen[slots] = frame_number
+        
+        # Latest three samples per track (read back as stored)
+        idx = (head[:, None] - np.arange(3)) % self.max_history
+        dist = self._hist_distance[slots[:, None], idx].astype(np.float64)
+        frames = self._hist_frame[slots[:, None], idx].astype(np.int64)
+        
+        # Velocity from last two measurements (positive = moving away)
+        dt = (frames[:, 0] - frames[:, 1]) / self.frame_rate
+        moving = (history_len >= 2) & (dt != 0)
+        velocity = np.zeros(len(slots))
+        np.divide(dist[:, 0] - dist[:, 1], dt, out=velocity, where=moving)
+        
+        # Acceleration if we have enough history
+        dt2 = (frames[:, 1] - frames[:, 2]) / self.frame_rate
+        accelerating = moving & (history_len >= 3) & (dt2 > 0)
+        velocity_prev = np.zeros(len(slots))
+        np.divide(dist[:, 1] - dist[:, 2], dt2, out=velocity_prev, where=accelerating)
+        acceleration = np.zeros(len(slots))
+        np.divide(velocity - velocity_prev, dt, out=acceleration, where=accelerating)
+        
+        return velocity, acceleration
+    
+    def _history_entry(self, slot: int, age: int) -> Tuple[float, int]:
+        """Return the age-th most recent (distance, frame_number) of a slot (1 = latest)."""
+        idx = (self._hist_head[slot] - age) % self.max_history
+        return float(self._hist_distance[slot, idx]), int(self._hist_frame[slot, idx])
+    
+    def _allocate_slot(self, track_id: int, frame_number: int) -> int:
+        """
+        Take a free history slot for a new track.
+        Tracks unseen for STALE_TRACK_FRAMES are evicted when slots run out;
+        if none are stale, the least recently seen track is dropped.
+        """
+        if not self._free_slots:
+            self._evict_stale_tracks(frame_number)
+        if not self._free_slots:
+            oldest_id = min(self._slot_of_id, key=lambda tid: self._last_seen[self._slot_of_id[tid]])
+            self._free_slots.append(self._slot_of_id.pop(oldest_id))
+        
+        slot = self._free_slots.pop()
+        self._slot_of_id[track_id] = slot
+        self._hist_len[slot] = 0
+        self._hist_head[slot] = 0
+        return slot
+    
+    def _evict_stale_tracks(self, frame_number: int):
+        """Release history slots of tracks not seen for STALE_TRACK_FRAMES."""
+        cutoff = frame_number - self.STALE_TRACK_FRAMES
+        stale = [tid for tid, slot in self._slot_of_id.items() if self._last_seen[slot] < cutoff]
+        for tid in stale:
+            self._free_slots.append(self._slot_of_id.pop(tid))
+    
     def compute_ttc(
         self, 
         distance: float, 
@@ -357,13 +465,146 @@ class DistanceEstimator:
         
         return tracked_obj
     
+    def compute_ttc_batch(
+        self,
+        distances: np.ndarray,
+        relative_velocities: np.ndarray,
+        min_ttc: float = 0.1,
+        max_ttc: float = 10.0
+    ) -> np.ndarray:
+        """
+        Vectorized compute_ttc() over all objects in a frame.
+        
+        Args:
+            distances: Distances in meters, shape (N,)
+            relative_velocities: Relative velocities in m/s, shape (N,)
+            min_ttc: Minimum TTC to return
+            max_ttc: Maximum TTC to return
+            
+        Returns:
+            TTC in seconds, shape (N,); NaN where not approaching
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        velocities = np.asarray(relative_velocities, dtype=np.float64)
+        
+        ttc = np.full(distances.shape, np.nan)
+        np.divide(distances, -velocities, out=ttc, where=velocities < 0)
+        np.clip(ttc, min_ttc, max_ttc, out=ttc)  # NaN stays NaN
+        
+        return ttc
+    
+    def classify_risk_batch(self, distances: np.ndarray, ttcs: np.ndarray) -> np.ndarray:
+        """
+        Vectorized classify_risk() - same precedence (TTC first, then distance).
+        
+        Args:
+            distances: Distances in meters, shape (N,)
+            ttcs: TTC in seconds, shape (N,); NaN if not approaching
+            
+        Returns:
+            Array of risk level strings, shape (N,)
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        ttc = np.nan_to_num(np.asarray(ttcs, dtype=np.float64), nan=np.inf)
+        
+        return np.select(
+            [
+                ttc < self.CRITICAL_TTC,
+                ttc < self.DANGER_TTC,
+                ttc < self.CAUTION_TTC,
+                distances < self.CRITICAL_DISTANCE,
+                distances < self.DANGER_DISTANCE,
+                distances < self.CAUTION_DISTANCE,
+            ],
+            ["CRITICAL", "DANGER", "CAUTION", "CRITICAL", "DANGER", "CAUTION"],
+            default="SAFE"
+        )
+    
+    def process_tracked_objects(
+        self,
+        tracked_objs: List[Dict],
+        frame_height: int,
+        frame_number: int
+    ) -> List[Dict]:
+        """
+        Batch version of process_tracked_object() for all objects in a frame.
+        Distance, TTC and risk are computed with one NumPy pass instead of
+        per-object Python arithmetic.
+        
+        Objects without an 'id' (plain detections) have no velocity history:
+        their velocity is 0, so TTC is None and risk comes from distance.
+        
+        Args:
+            tracked_objs: Tracked object dicts with 'bbox', 'class_name' and,
+                          for velocity/TTC, a persistent 'id'
+            frame_height: Frame height in pixels
+            frame_number: Current frame number
+            
+        Returns:
+            Same list, each dict enhanced with distance, velocity, TTC, risk metrics
+        """
+        if not tracked_objs:
+            return tracked_objs
+        
+        n = len(tracked_objs)
+        heights = self.VEHICLE_HEIGHTS
+        default_height = heights['car']
+        bboxes = np.array([obj['bbox'] for obj in tracked_objs], dtype=np.float64)
+        real_heights = np.fromiter(
+            (heights.get(obj.get('class_name', 'car'), default_height) for obj in tracked_objs),
+            dtype=np.float64, count=n
+        )
+        
+        # Pinhole model, same as estimate_distance_bbox()
+        bbox_heights = bboxes[:, 3] - bboxes[:, 1]
+        valid = bbox_heights > 0
+        distances = np.full(n, 100.0)
+        distances[valid] = np.clip(
+            real_heights[valid] * self.focal_length / bbox_heights[valid], 1.0, 200.0
+        )
+        
+        # Velocity needs per-track history
+        track_ids = [obj.get('id') for obj in tracked_objs]
+        tracked = np.fromiter((tid is not None for tid in track_ids), dtype=bool, count=n)
+        velocities = np.zeros(n)
+        accelerations = np.zeros(n)
+        if tracked.any():
+            velocities[tracked], accelerations[tracked] = self.estimate_velocities(
+                [tid for tid in track_ids if tid is not None], distances[tracked], frame_number
+            )
+        
+        ttcs = self.compute_ttc_batch(distances, velocities)
+        risk_levels = self.classify_risk_batch(distances, ttcs)
+        
+        approaching = velocities < 0
+        closing_speeds = np.where(approaching, -velocities, 0.0)
+        ttcs = np.where(np.isnan(ttcs), None, ttcs)
+        
+        # Arrays -> Python scalars once per column, not per element
+        for obj, distance, velocity, acceleration, ttc, risk_level, is_approaching, closing_speed in zip(
+            tracked_objs, distances.tolist(), velocities.tolist(), accelerations.tolist(),
+            ttcs.tolist(), risk_levels.tolist(), approaching.tolist(), closing_speeds.tolist()
+        ):
+            obj.update({
+                'distance': distance,
+                'relative_velocity': velocity,
+                'acceleration': acceleration,
+                'ttc': ttc,
+                'risk_level': risk_level,
+                'is_approaching': is_approaching,
+                'closing_speed': closing_speed
+            })
+        
+        return tracked_objs
+    
     def draw_distance_info(
         self, 
         frame: np.ndarray, 
         bbox: list, 
         distance: float,
         risk_level: str,
-        ttc: Optional[float] = None
+        ttc: Optional[float] = None,
+        inplace: bool = False
     ) -> np.ndarray:
         """
         Draw distance and risk information on frame.
@@ -374,18 +615,20 @@ class DistanceEstimator:
             distance: Distance in meters
             risk_level: "SAFE", "CAUTION", or "DANGER"
             ttc: Time-to-collision in seconds (optional)
+            inplace: Draw on frame itself instead of a copy
             
         Returns:
             Annotated frame
         """
-        annotated = frame.copy()
+        annotated = frame if inplace else frame.copy()
         x1, y1, x2, y2 = bbox
         
         # Color based on risk
         color_map = {
             "SAFE": (0, 255, 0),      # Green
             "CAUTION": (0, 165, 255),  # Orange
-            "DANGER": (0, 0, 255)      # Red
+            "DANGER": (0, 0, 255),     # Red
+            "CRITICAL": (0, 0, 255)    # Red
         }
         color = color_map.get(risk_level, (255, 255, 255))
         
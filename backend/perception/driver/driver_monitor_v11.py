@@ -53,31 +53,20 @@ class TemporalDriverState:
         self.window_size = int(window_seconds * frame_rate)
         self.alpha = alpha
         
-        # Rolling buffers, enable_temporal: bool = True):
-        """
-        Initialize driver monitor.
-        
-        Args:
-            device: "cuda" or "cpu" (MediaPipe uses CPU)
-            enable_temporal: Enable temporal smoothing and sustained state detection
-        """
-        self.device = device
-        self.mp_face_mesh = None
-        self.face_mesh = None
-        
-        # State tracking
-        self.closed_eye_counter = 0
-        self.yawn_counter = 0
-        self.is_drowsy = False
-        
-        # Temporal state tracking (PRODUCTION)
-        self.enable_temporal = enable_temporal
-        self.temporal_state = TemporalDriverState(
-            window_seconds=3.0,
-            frame_rate=30,
-            alpha=0.2
-        ) if enable_temporal else None
-        self.frame_number = 0
+        # Rolling buffers
+        self.ear_buffer = deque(maxlen=self.window_size)
+        self.mar_buffer = deque(maxlen=self.window_size)
+        self.yaw_buffer = deque(maxlen=self.window_size)
+        self.pitch_buffer = deque(maxlen=self.window_size)
+        self.drowsy_state_buffer = deque(maxlen=self.window_size)
+        
+        # EMA-smoothed values (None until the first measurement)
+        self.smoothed_ear = None
+        self.smoothed_mar = None
+        self.smoothed_yaw = None
+        self.smoothed_pitch = None
+        
+        # Alert cooldown
         self.last_alert_time = {}  # {alert_type: frame_number}
         self.alert_cooldown_frames = 150  # 5 seconds @ 30fps
     
@@ -206,41 +195,85 @@ class DriverMonitorV11:
     # Mouth landmarks
     MOUTH = [61, 291, 0, 17, 269, 405]
     
+    # Nose tip, chin, eye corners, mouth corners (see estimate_head_pose)
+    HEAD_POSE_POINTS = [1, 152, 33, 263, 61, 291]
+    
+    # Every landmark index read per frame; only these are converted
+    USED_LANDMARKS = np.unique(LEFT_EYE + RIGHT_EYE + MOUTH + HEAD_POSE_POINTS)
+    
     # Thresholds
     EAR_THRESHOLD = 0.25  # Below this = eyes closed
     MAR_THRESHOLD = 0.6   # Above this = mouth open (yawning)
     DROWSY_FRAMES = 20    # Consecutive frames to trigger drowsy
     
-    def __init__(self, device: str = "cpu"):
+    # FaceMesh input width (larger frames are downscaled once before inference)
+    PROCESS_WIDTH = 640
+    
+    def __init__(self, device: str = "cpu", enable_temporal: bool = True):
         """
         Initialize driver monitor.
         
         Args:
             device: "cuda" or "cpu" (MediaPipe uses CPU)
+            enable_temporal: Enable temporal smoothing and sustained state detection
         """
         self.device = device
         self.mp_face_mesh = None
         self.face_mesh = None
-        
-        # State tracking
-        self.closed_eye_counter = 0
-        self.yawn_counter = 0
-        self.is_drowsy = False
+        self.enable_temporal = enable_temporal
         
         # Try to load MediaPipe
         try:
             import mediapipe as mp
             self.mp_face_mesh = mp.solutions.face_mesh
-            self.face_mesh = self.mp_face_mesh.FaceMesh(
-                max_num_faces=1,
-                refine_landmarks=True,
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            )
+            self.face_mesh = self._create_face_mesh()
             logger.info("MediaPipe Face Mesh initialized")
         except ImportError:
             logger.error("mediapipe package not installed. Install: pip install mediapipe")
             raise
+        
+        self._reset_tracking_state()
+    
+    def _create_face_mesh(self):
+        """Build a FaceMesh graph in video (tracking) mode."""
+        return self.mp_face_mesh.FaceMesh(
+            max_num_faces=1,
+            # Iris refinement (landmarks 468-477) runs an extra attention
+            # model per frame; EAR/MAR/head pose only use the base 468
+            refine_landmarks=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+    
+    def _reset_tracking_state(self):
+        """(Re)initialize every per-video counter, buffer and temporal window."""
+        # State tracking
+        self.closed_eye_counter = 0
+        self.yawn_counter = 0
+        self.is_drowsy = False
+        self.frame_number = 0
+        
+        # Temporal state tracking (PRODUCTION)
+        self.temporal_state = TemporalDriverState(
+            window_seconds=3.0,
+            frame_rate=30,
+            alpha=0.2
+        ) if self.enable_temporal else None
+        
+        # Reused RGB conversion buffer (avoids a per-frame allocation)
+        self._rgb_buffer = None
+    
+    def reset(self):
+        """
+        Clear all per-video state so the monitor can start a new video.
+        
+        FaceMesh in video mode tracks the face from the previous frame and
+        has no public reset, so its graph is rebuilt as well.
+        """
+        self._reset_tracking_state()
+        if self.face_mesh is not None:
+            self.face_mesh.close()
+        self.face_mesh = self._create_face_mesh()
     
     def calculate_ear(self, eye_landmarks: np.ndarray) -> float:
         """
@@ -480,8 +513,21 @@ class DriverMonitorV11:
         self.frame_number += 1
         height, width = frame.shape[:2]
         
-        # Convert to RGB (MediaPipe expects RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Downscale to FaceMesh working resolution once (INTER_AREA).
+        # Landmarks are normalized, so they still map to full-res coordinates.
+        model_input = frame
+        if width > self.PROCESS_WIDTH:
+            scaled_height = int(height * self.PROCESS_WIDTH / width)
+            model_input = cv2.resize(
+                frame,
+                (self.PROCESS_WIDTH, scaled_height),
+                interpolation=cv2.INTER_AREA
+            )
+        
+        # Convert to RGB (MediaPipe expects RGB) into the reused buffer
+        if self._rgb_buffer is None or self._rgb_buffer.shape != model_input.shape:
+            self._rgb_buffer = np.empty_like(model_input)
+        rgb_frame = cv2.cvtColor(model_input, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
         
         # Process with MediaPipe
         results = self.face_mesh.process(rgb_frame)
@@ -494,17 +540,20 @@ class DriverMonitorV11:
         is_drowsy = False
         drowsy_reason = "NO_FACE"
         
-        annotated_frame = frame.copy()
-        
         if results.multi_face_landmarks:
             face_detected = True
             face_landmarks = results.multi_face_landmarks[0]
             
-            # Convert landmarks to numpy array
-            landmarks = np.array([
-                [lm.x * width, lm.y * height] 
-                for lm in face_landmarks.landmark
-            ])
+            # Convert only the 20 landmarks we read (not all 468) and
+            # scatter them into a full-size array in one vectorized store
+            lms = face_landmarks.landmark
+            used = self.USED_LANDMARKS
+            landmarks = np.zeros((len(lms), 2))
+            landmarks[used] = np.fromiter(
+                (c for i in used for c in (lms[i].x, lms[i].y)),
+                dtype=np.float64,
+                count=2 * len(used)
+            ).reshape(-1, 2) * (width, height)
             
             # Extract eye landmarks
             left_eye = landmarks[self.LEFT_EYE]
@@ -574,6 +623,9 @@ class DriverMonitorV11:
                     (0, 0, 255),
                     3
                 )
+        else:
+            # draw_facial_landmarks already copies; only copy when no face
+            annotated_frame = frame.copy()
         
         # Get temporal metrics (PRODUCTION)
         is_sustained_drowsy = False
@@ -130,6 +130,12 @@ class LaneDetectorV11:
     - Reduced flickering and improved stability
     """
     
+    # Frame-similarity gating: reuse the last lane fit while the road ROI's
+    # 64-bit average hash differs by at most SIMILAR_HASH_BITS, for at most
+    # MAX_REUSED_FRAMES consecutive frames
+    SIMILAR_HASH_BITS = 3
+    MAX_REUSED_FRAMES = 4
+    
     def __init__(self, device: str = "cpu"):
         """
         Initialize lane detector.
@@ -159,29 +165,61 @@ class LaneDetectorV11:
         self.departure_threshold = 0.3  # 30% offset from center
         self.min_confidence = 0.3  # Minimum confidence to use detection
         
+        # Similarity gating state
+        self._last_hash = None
+        self._last_fits = None
+        self._reused_frames = 0
+        
+        # Lane-area fill mask for draw_lane (allocated on first use)
+        self._lane_mask = None
+        
         logger.info(f"LaneDetectorV11 initialized on {device} with Kalman Filter smoothing")
     
-    def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
+    @staticmethod
+    def _band_top(height: int) -> int:
+        """
+        First row of the grayscale road band. Only the ROI (y >= 0.6 * height)
+        is used; a few rows of margin keep the 5x5 blur and Sobel apertures
+        identical at the ROI edge.
+        """
+        return max(int(height * 0.6) - 4, 0)
+    
+    @staticmethod
+    def _roi_hash(gray_roi: np.ndarray) -> int:
+        """64-bit average hash of the grayscale road ROI (bottom 40% of the frame)."""
+        small = cv2.resize(gray_roi, (8, 8), interpolation=cv2.INTER_AREA)
+        return int.from_bytes(np.packbits(small > small.mean()).tobytes(), "big")
+    
+    def preprocess_frame(self, frame: np.ndarray, gray_band: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Preprocess frame for lane detection.
         
         Args:
             frame: RGB frame from video
+            gray_band: Grayscale frame[_band_top(height):] if already computed
             
         Returns:
             Binary edge map
         """
+        height, width = frame.shape[:2]
+        
+        # Only the ROI band survives the mask below, so run
+        # grayscale/blur/Canny on that band only
+        band_top = self._band_top(height)
+        
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        if gray_band is None:
+            gray_band = cv2.cvtColor(frame[band_top:], cv2.COLOR_RGB2GRAY)
+        gray = gray_band
         
         # Apply Gaussian blur
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
         
-        # Canny edge detection
-        edges = cv2.Canny(blurred, 50, 150)
+        # Canny edge detection (full-frame coordinates for Hough)
+        edges = np.zeros((height, width), dtype=np.uint8)
+        edges[band_top:] = cv2.Canny(blurred, 50, 150)
         
         # Region of interest (lower half of frame)
-        height, width = edges.shape
         mask = np.zeros_like(edges)
         
         # Define ROI polygon (trapezoid for perspective)
@@ -220,32 +258,26 @@ class LaneDetectorV11:
         if lines is None:
             return None, None
         
-        # Separate left and right lanes
-        left_lines = []
-        right_lines = []
-        
+        # Separate left and right lanes (vectorized over all segments)
         height, width = edges.shape
         mid_x = width // 2
         
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            
-            # Calculate slope
-            if x2 - x1 == 0:
-                continue
-            slope = (y2 - y1) / (x2 - x1)
-            
-            # Filter by slope and position
-            if slope < -0.3 and x1 < mid_x and x2 < mid_x:
-                # Left lane (negative slope)
-                left_lines.append([(x1, y1), (x2, y2)])
-            elif slope > 0.3 and x1 > mid_x and x2 > mid_x:
-                # Right lane (positive slope)
-                right_lines.append([(x1, y1), (x2, y2)])
-        
-        # Extract points from lines
-        left_points = np.array([[p[0], p[1]] for line in left_lines for p in line]) if left_lines else None
-        right_points = np.array([[p[0], p[1]] for line in right_lines for p in line]) if right_lines else None
+        segments = lines.reshape(-1, 4)  # (N, 4): x1, y1, x2, y2
+        x1, y1, x2, y2 = segments.T
+        
+        # Calculate slope (vertical segments are skipped)
+        dx = (x2 - x1).astype(np.float64)
+        non_vertical = dx != 0
+        slope = np.divide(y2 - y1, dx, out=np.zeros_like(dx), where=non_vertical)
+        
+        # Filter by slope and position
+        # Left lane (negative slope), right lane (positive slope)
+        left_mask = non_vertical & (slope < -0.3) & (x1 < mid_x) & (x2 < mid_x)
+        right_mask = non_vertical & (slope > 0.3) & (x1 > mid_x) & (x2 > mid_x)
+        
+        # Extract points from lines: each segment contributes (x1, y1), (x2, y2)
+        left_points = segments[left_mask].reshape(-1, 2) if left_mask.any() else None
+        right_points = segments[right_mask].reshape(-1, 2) if right_mask.any() else None
         
         return left_points, right_points
     
@@ -347,8 +379,11 @@ class LaneDetectorV11:
             # Create polygon for lane area
             lane_polygon = np.concatenate([left_points, right_points[::-1]])
             
-            # Create mask
-            mask = np.zeros_like(frame)
+            # Create mask (buffer reused across frames)
+            mask = self._lane_mask
+            if mask is None or mask.shape != frame.shape:
+                mask = self._lane_mask = np.empty_like(frame)
+            mask.fill(0)
             cv2.fillPoly(mask, [lane_polygon], (0, 255, 0))
             
             # Blend with original frame
@@ -423,23 +458,45 @@ class LaneDetectorV11:
         """
         height, width = frame.shape[:2]
         
-        # Preprocess
-        edges = self.preprocess_frame(frame)
-        
-        # Detect lane lines
-        left_points, right_points = self.detect_lane_lines(edges)
-        
-        # Fit polynomials with confidence
-        left_fit_raw, left_conf = self.fit_polynomial(left_points)
-        right_fit_raw, right_conf = self.fit_polynomial(right_points)
-        
-        # PRODUCTION: Apply Kalman Filter smoothing instead of EMA
-        left_fit = self.kalman_left.update(left_fit_raw, left_conf)
-        right_fit = self.kalman_right.update(right_fit_raw, right_conf)
+        # Grayscale road band, converted once and shared by the similarity
+        # hash and edge detection
+        band_top = self._band_top(height)
+        gray_band = cv2.cvtColor(frame[band_top:], cv2.COLOR_RGB2GRAY)
+        
+        # Near-identical road view: skip edge/Hough/fit and reuse last fit
+        frame_hash = self._roi_hash(gray_band[int(height * 0.6) - band_top:])
+        reuse = (
+            self._last_fits is not None and
+            self._reused_frames < self.MAX_REUSED_FRAMES and
+            bin(frame_hash ^ self._last_hash).count("1") <= self.SIMILAR_HASH_BITS
+        )
         
-        # Update temporal filter for confidence tracking (backward compatibility)
-        self.temporal_filter.update(left_fit_raw, right_fit_raw, left_conf, right_conf)
-        self.left_confidence, self.right_confidence = self.temporal_filter.get_confidence()
+        if reuse:
+            self._reused_frames += 1
+            left_fit, right_fit = self._last_fits
+        else:
+            self._reused_frames = 0
+            self._last_hash = frame_hash
+            
+            # Preprocess
+            edges = self.preprocess_frame(frame, gray_band)
+            
+            # Detect lane lines
+            left_points, right_points = self.detect_lane_lines(edges)
+            
+            # Fit polynomials with confidence
+            left_fit_raw, left_conf = self.fit_polynomial(left_points)
+            right_fit_raw, right_conf = self.fit_polynomial(right_points)
+            
+            # PRODUCTION: Apply Kalman Filter smoothing instead of EMA
+            left_fit = self.kalman_left.update(left_fit_raw, left_conf)
+            right_fit = self.kalman_right.update(right_fit_raw, right_conf)
+            
+            # Update temporal filter for confidence tracking (backward compatibility)
+            self.temporal_filter.update(left_fit_raw, right_fit_raw, left_conf, right_conf)
+            self.left_confidence, self.right_confidence = self.temporal_filter.get_confidence()
+            
+            self._last_fits = (left_fit, right_fit)
         
         # Draw lanes only if confidence is sufficient
         if self.left_confidence >= self.min_confidence or self.right_confidence >= self.min_confidence:
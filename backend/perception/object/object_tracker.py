@@ -19,6 +19,8 @@ from typing import List, Dict, Optional, Tuple
 from collections import defaultdict, deque
 import logging
 
+from scipy.optimize import linear_sum_assignment
+
 logger = logging.getLogger(__name__)
 
 
@@ -222,33 +224,45 @@ class ByteTracker:
         logger.info(f"ByteTracker initialized with thresh={track_thresh}, match={match_thresh}")
     
     @staticmethod
-    def _iou(bbox1: np.ndarray, bbox2: np.ndarray) -> float:
+    def _iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
         """
-        Calculate IoU between two bounding boxes.
+        Calculate pairwise IoU between two sets of bounding boxes.
         
         Args:
-            bbox1: [x1, y1, x2, y2]
-            bbox2: [x1, y1, x2, y2]
+            boxes1: (N, 4) array of [x1, y1, x2, y2]
+            boxes2: (M, 4) array of [x1, y1, x2, y2]
             
         Returns:
-            IoU score [0-1]
+            (N, M) IoU matrix [0-1]
         """
-        x1 = max(bbox1[0], bbox2[0])
-        y1 = max(bbox1[1], bbox2[1])
-        x2 = min(bbox1[2], bbox2[2])
-        y2 = min(bbox1[3], bbox2[3])
-        
-        inter_area = max(0, x2 - x1) * max(0, y2 - y1)
+        x1 = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+        y1 = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+        x2 = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+        y2 = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
         
-        bbox1_area = (bbox1[2] - bbox1[0]) * (bbox1[3] - bbox1[1])
-        bbox2_area = (bbox2[2] - bbox2[0]) * (bbox2[3] - bbox2[1])
+        inter_area = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
         
-        union_area = bbox1_area + bbox2_area - inter_area
+        area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+        area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
         
-        if union_area == 0:
-            return 0.0
+        union_area = area1[:, None] + area2[None, :] - inter_area
         
-        return inter_area / union_area
+        iou = np.zeros_like(inter_area)
+        np.divide(inter_area, union_area, out=iou, where=union_area != 0)
+        return iou
+    
+    @staticmethod
+    def _track_boxes(tracks: List[KalmanBoxTracker]) -> np.ndarray:
+        """
+        Current [x1, y1, x2, y2] of every track as one (M, 4) array,
+        converted from the stacked Kalman states in a single pass.
+        """
+        z = np.hstack([track.kf.x[:4] for track in tracks])  # (4, M)
+        cx, cy, area, ratio = z
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = np.sqrt(area * ratio)
+            h = np.where(w > 0, area / w, 1.0)
+        return np.stack([cx - w / 2.0, cy - h / 2.0, cx + w / 2.0, cy + h / 2.0], axis=1)
     
     def update(self, detections: List[Dict]) -> List[Dict]:
         """
@@ -296,8 +310,9 @@ class ByteTracker:
             track = self.tracked_tracks[track_idx]
             self.lost_tracks.append(track)
         
+        lost_idx = set(unmatched_tracks)
         self.tracked_tracks = [t for i, t in enumerate(self.tracked_tracks) 
-                              if i not in unmatched_tracks]
+                              if i not in lost_idx]
         
         # Try to recover lost tracks with low confidence detections
         if len(low_conf_dets) > 0 and len(self.lost_tracks) > 0:
@@ -313,8 +328,9 @@ class ByteTracker:
                 track.update(det['bbox'], det['confidence'])
                 self.tracked_tracks.append(track)
             
+            recovered_idx = {m[0] for m in matched_lost}
             self.lost_tracks = [t for i, t in enumerate(self.lost_tracks)
-                               if i not in [m[0] for m in matched_lost]]
+                               if i not in recovered_idx]
         
         # Remove old lost tracks
         self.lost_tracks = [t for t in self.lost_tracks 
@@ -350,29 +366,21 @@ class ByteTracker:
         if len(detections) == 0:
             return [], list(range(len(tracks))), []
         
-        # Calculate IoU matrix
-        iou_matrix = np.zeros((len(tracks), len(detections)))
-        
-        for t_idx, track in enumerate(tracks):
-            track_bbox = track.get_state()['bbox']
-            for d_idx, det in enumerate(detections):
-                iou_matrix[t_idx, d_idx] = self._iou(track_bbox, det['bbox'])
+        # Calculate IoU matrix (all pairs in one broadcast)
+        det_boxes = np.array([det['bbox'] for det in detections], dtype=np.float64)
+        iou_matrix = self._iou_matrix(self._track_boxes(tracks), det_boxes)
         
         # Hungarian matching
-        from scipy.optimize import linear_sum_assignment
-        
         track_indices, det_indices = linear_sum_assignment(-iou_matrix)
         
         # Filter matches by IoU threshold
-        matched = []
-        unmatched_tracks = list(range(len(tracks)))
-        unmatched_dets = list(range(len(detections)))
-        
-        for t_idx, d_idx in zip(track_indices, det_indices):
-            if iou_matrix[t_idx, d_idx] >= self.match_thresh:
-                matched.append((t_idx, d_idx))
-                unmatched_tracks.remove(t_idx)
-                unmatched_dets.remove(d_idx)
+        keep = iou_matrix[track_indices, det_indices] >= self.match_thresh
+        track_indices = track_indices[keep]
+        det_indices = det_indices[keep]
+        matched = list(zip(track_indices.tolist(), det_indices.tolist()))
+        
+        unmatched_tracks = np.setdiff1d(np.arange(len(tracks)), track_indices).tolist()
+        unmatched_dets = np.setdiff1d(np.arange(len(detections)), det_indices).tolist()
         
         return matched, unmatched_tracks, unmatched_dets
     
@@ -20,10 +20,19 @@ Date: 2025-12-21
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 import json
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import av  # PyAV (optional): direct libavcodec decode
+except ImportError:
+    av = None
 
 # Import perception modules
 from ..lane.lane_detector_v11 import LaneDetectorV11
@@ -35,12 +44,179 @@ from ..traffic.traffic_sign_v11 import TrafficSignV11
 logger = logging.getLogger(__name__)
 
 
+class _CudaCodecCapture:
+    """
+    NVDEC decode through cv2.cudacodec with the colour conversion done on
+    the GPU, so frames are downloaded already in the pipeline's RGB layout.
+    Container metadata (fps, size, frame count) comes from a regular
+    VideoCapture. Mirrors the part of the cv2.VideoCapture API used by
+    process_video().
+    """
+    
+    yields_rgb = True
+    
+    def __init__(self, input_path: str):
+        self._meta = cv2.VideoCapture(input_path)
+        self._reader = cv2.cudacodec.createVideoReader(input_path)
+        self._gpu_rgb = cv2.cuda_GpuMat()
+        self._host_mem = []  # keeps pinned frame buffers alive
+    
+    def alloc_frame(self, height: int, width: int) -> np.ndarray:
+        """
+        Page-locked host buffer for download(): the device->host copy of
+        each decoded frame runs as a direct DMA instead of being staged
+        through a pageable bounce buffer by the driver.
+        """
+        try:
+            mem = cv2.cuda.HostMem(height, width, cv2.CV_8UC3, cv2.cuda.HostMem_PAGE_LOCKED)
+            self._host_mem.append(mem)
+            return mem.createMatHeader()
+        except cv2.error:
+            return np.empty((height, width, 3), dtype=np.uint8)
+    
+    def isOpened(self) -> bool:
+        return self._meta.isOpened()
+    
+    def get(self, prop_id: int) -> float:
+        return self._meta.get(prop_id)
+    
+    def read(self, image: Optional[np.ndarray] = None):
+        ok, gpu_frame = self._reader.nextFrame()
+        if not ok:
+            return False, None
+        code = cv2.COLOR_BGRA2RGB if gpu_frame.channels() == 4 else cv2.COLOR_BGR2RGB
+        self._gpu_rgb = cv2.cuda.cvtColor(gpu_frame, code, dst=self._gpu_rgb)
+        return True, self._gpu_rgb.download(image)
+    
+    def release(self):
+        self._meta.release()
+        self._reader = None
+
+
+class _PyAVCapture:
+    """
+    Software decode through PyAV with libavcodec frame/slice threading,
+    converting straight to RGB in libswscale (no BGR intermediate and no
+    separate cvtColor pass). Frames wider than max_width are downscaled in
+    the same swscale pass, keeping the aspect ratio; `scale` is the factor
+    applied. Mirrors the part of the cv2.VideoCapture API used by
+    process_video().
+    """
+    
+    yields_rgb = True
+    
+    def __init__(self, input_path: str, max_width: Optional[int] = None):
+        self._container = av.open(input_path)
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        self._frames = self._container.decode(self._stream)
+        
+        codec = self._stream.codec_context
+        self.scale = 1.0
+        self._width, self._height = codec.width, codec.height
+        if max_width and codec.width > max_width:
+            self.scale = max_width / codec.width
+            self._width = max_width
+            self._height = max(2, round(codec.height * self.scale / 2) * 2)
+    
+    def isOpened(self) -> bool:
+        return self._container is not None
+    
+    def get(self, prop_id: int) -> float:
+        stream = self._stream
+        fps = float(stream.average_rate or 0)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return fps
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            if stream.frames:
+                return float(stream.frames)
+            # Container without a frame count: estimate from duration
+            if stream.duration and stream.time_base:
+                return float(int(stream.duration * stream.time_base * fps))
+        return 0.0
+    
+    def read(self, image: Optional[np.ndarray] = None):
+        try:
+            frame = next(self._frames)
+        except (StopIteration, av.error.FFmpegError):
+            return False, None
+        if self.scale == 1.0:
+            return True, frame.to_ndarray(format="rgb24")
+        return True, frame.to_ndarray(
+            format="rgb24", width=self._width, height=self._height,
+            interpolation="AREA"
+        )
+    
+    def release(self):
+        if self._container is not None:
+            self._container.close()
+            self._container = None
+
+
+class _AsyncVideoWriter:
+    """
+    cv2.VideoWriter with RGB->BGR conversion and encoding moved to a
+    background thread, so mp4v encode overlaps inference on the next frames.
+    write() takes annotated RGB frames, which are fresh arrays per frame and
+    never touched again by the pipeline, so they are queued without a copy.
+    """
+    
+    def __init__(self, writer: cv2.VideoWriter, max_pending: int = 32):
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="video-encode", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        bgr = None
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            try:
+                bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=bgr)
+                self._writer.write(bgr)
+            except Exception as e:
+                logger.error(f"❌ Failed to write output frame: {e}")
+    
+    def write(self, rgb_frame: np.ndarray):
+        self._queue.put(rgb_frame)
+    
+    def release(self):
+        """Flush pending frames and close the file."""
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.release()
+
+
 class VideoPipelineV11:
     """
     Unified ADAS video processing pipeline.
     Processes ANY driving video (dashcam or in-cabin) with REAL analysis.
     """
     
+    # Re-emit an ongoing drowsiness state at most once per N frames
+    DROWSY_EVENT_INTERVAL = 30
+    
+    # Decoded frames the decoder thread may run ahead of inference
+    PREFETCH_FRAMES = 16
+    
+    # Wider sources are downscaled while decoding (PyAV path). YOLO runs at
+    # 640 anyway, so 4K/1440p input only costs bandwidth in every
+    # per-frame OpenCV/NumPy stage and in the encoder.
+    MAX_DECODE_WIDTH = 1920
+    
+    # YOLO input size. 640 matches the COCO training resolution; 416/320
+    # run 2-4x faster at some loss of recall on small, distant objects
+    INFERENCE_IMGSZ = 640
+    
+    # Per-frame decay of the latency EMA behind progress fps/ETA
+    LATENCY_EMA_DECAY = 0.9
+    
     def __init__(
         self, 
         device: str = "cpu",
@@ -57,9 +233,16 @@ class VideoPipelineV11:
         self.video_type = video_type
         self.events = []
         
-        # PRODUCTION OPTIMIZATION: Batch size for GPU inference
-        # Process 4-8 frames at once for better GPU utilization
-        self.batch_size = 6 if device == "cuda" else 1
+        # PRODUCTION OPTIMIZATION: Batch size for YOLO inference
+        # Process 4-8 frames at once for better GPU utilization. On CPU a
+        # smaller batch still amortizes per-call preprocessing, NMS and
+        # operator dispatch across frames.
+        # In-cabin frames go through MediaPipe one image at a time on CPU,
+        # so buffering them only adds latency and memory.
+        if video_type == "dashcam":
+            self.batch_size = 6 if device == "cuda" else 4
+        else:
+            self.batch_size = 1
         
         logger.info(f"VideoPipelineV11 initializing (device={device}, type={video_type}, batch_size={self.batch_size})")
         
@@ -86,13 +269,21 @@ class VideoPipelineV11:
                 self.lane_detector = LaneDetectorV11(device=self.device)
                 logger.info("  ✓ Lane detector initialized")
                 
-                self.object_detector = ObjectDetectorV11(device=self.device)
+                self.object_detector = ObjectDetectorV11(
+                    device=self.device, imgsz=self.INFERENCE_IMGSZ
+                )
                 logger.info("  ✓ Object detector initialized")
                 
                 self.distance_estimator = DistanceEstimator()
                 logger.info("  ✓ Distance estimator initialized")
                 
-                self.traffic_sign_detector = TrafficSignV11(device=self.device)
+                # Both detectors run the same COCO yolo11n: load the weights
+                # once and read signs from the object detector's pass
+                self.traffic_sign_detector = TrafficSignV11(
+                    device=self.device,
+                    shared_model=self.object_detector.model,
+                    imgsz=self.INFERENCE_IMGSZ
+                )
                 logger.info("  ✓ Traffic sign detector initialized")
                 
                 self.driver_monitor = None
@@ -117,6 +308,18 @@ class VideoPipelineV11:
         else:
             raise ValueError(f"Unknown video_type: {video_type}. Use 'dashcam' or 'in_cabin'")
         
+        # Lazily created DriverMonitor for video type auto-detection
+        self._probe_monitor = None
+        
+        # Drowsiness event throttling state
+        self._last_drowsy_reason = None
+        self._last_drowsy_event_frame = -self.DROWSY_EVENT_INTERVAL
+        
+        # Progress throughput: (time, frame_idx) of the last progress log
+        # and the per-frame latency EMA (seconds)
+        self._progress_mark = None
+        self._ema_latency = None
+        
         # Event logging
         self.events = []
         
@@ -138,8 +341,11 @@ class VideoPipelineV11:
         
         if self.driver_monitor is None:
             try:
-                temp_monitor = DriverMonitorV11(device=self.device)
-                result = temp_monitor.process_frame(frame)
+                # Reuse one probe monitor: FaceMesh graph setup is far more
+                # expensive than a single frame of inference
+                if self._probe_monitor is None:
+                    self._probe_monitor = DriverMonitorV11(device=self.device)
+                result = self._probe_monitor.process_frame(frame)
                 
                 if result['face_detected']:
                     logger.info("Auto-detected: in-cabin video (face found)")
@@ -150,6 +356,70 @@ class VideoPipelineV11:
         logger.info("Auto-detected: dashcam video")
         return "dashcam"
     
+    def _decode_frames(
+        self,
+        cap,
+        ring: List[np.ndarray],
+        frame_queue: "queue.Queue",
+        stop: threading.Event
+    ):
+        """
+        Decoder thread: read frames, convert to RGB into the ring buffers
+        and hand them to process_video. Puts None at end of stream.
+        
+        cv2 releases the GIL while decoding and converting, so this runs
+        in parallel with inference on the main thread.
+        """
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        # cudacodec / PyAV captures already deliver RGB: no conversion pass
+        decodes_rgb = getattr(cap, "yields_rgb", False)
+        bgr_buffer = np.empty_like(ring[0])
+        
+        slot = 0
+        try:
+            while True:
+                rgb = ring[slot]
+                ret, frame = cap.read(rgb if decodes_rgb else bgr_buffer)
+                if not ret:
+                    break
+                
+                if not decodes_rgb:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+                
+                if not put(frame):
+                    return
+                slot = (slot + 1) % len(ring)
+        except Exception as e:
+            logger.error(f"❌ Video decode failed: {e}")
+        finally:
+            put(None)
+    
+    def _detect_batch(self, frames: List[np.ndarray]) -> Tuple[List[List[Dict]], List[List[Dict]]]:
+        """
+        Batch object + traffic sign detection (GPU optimized): one shared
+        COCO YOLO pass per batch feeds both detectors.
+        
+        Returns:
+            (detections per frame, sign detections per frame)
+        """
+        try:
+            results = self.object_detector.predict_batch(frames)
+            batch_detections = [self.object_detector.extract_detections(r) for r in results]
+            batch_signs = self.traffic_sign_detector.signs_from_results(results)
+        except Exception as e:
+            logger.error(f"Batch detection failed: {e}")
+            batch_detections = [[] for _ in frames]
+            batch_signs = [[] for _ in frames]
+        return batch_detections, batch_signs
+    
     def _process_frame_batch(
         self,
         frames: List[np.ndarray],
@@ -159,31 +429,33 @@ class VideoPipelineV11:
         fps: float,
         total_frames: int,
         progress_callback: Optional[callable],
-        start_time: datetime
+        start_time: float,
+        detections: Optional[Future] = None
     ):
         """
         Process a batch of frames (PRODUCTION OPTIMIZATION).
         Uses batch inference for better GPU utilization.
+        
+        detections: dashcam only - _detect_batch(frames) already submitted
+        to the inference thread; run inline when not given.
         """
         batch_size = len(frames)
         
         # Process based on video type
         if self.video_type == "dashcam":
-            # Batch object detection (GPU optimized)
-            if hasattr(self.object_detector, 'detect_batch'):
-                batch_detections = self.object_detector.detect_batch(frames)
+            if detections is not None:
+                batch_detections, batch_signs = detections.result()
             else:
-                batch_detections = [self.object_detector.detect(f) for f in frames]
+                batch_detections, batch_signs = self._detect_batch(frames)
             
             # Process each frame with batch detections
             for i, (frame, frame_idx, timestamp) in enumerate(zip(frames, frame_indices, timestamps)):
-                detections = batch_detections[i]
+                frame_detections = batch_detections[i]
                 result = self._process_dashcam_frame_with_detections(
-                    frame, frame_idx, timestamp, detections
+                    frame, frame_idx, timestamp, frame_detections, batch_signs[i]
                 )
                 
-                bgr_frame = cv2.cvtColor(result['annotated_frame'], cv2.COLOR_RGB2BGR)
-                video_writer.write(bgr_frame)
+                video_writer.write(result['annotated_frame'])
                 
                 if frame_idx % 30 == 0:
                     self._log_progress(frame_idx, total_frames, start_time)
@@ -193,70 +465,125 @@ class VideoPipelineV11:
         else:  # in_cabin
             for frame, frame_idx, timestamp in zip(frames, frame_indices, timestamps):
                 result = self.process_incabin_frame(frame, frame_idx, timestamp)
-                bgr_frame = cv2.cvtColor(result['annotated_frame'], cv2.COLOR_RGB2BGR)
-                video_writer.write(bgr_frame)
+                video_writer.write(result['annotated_frame'])
                 
                 if frame_idx % 30 == 0:
                     self._log_progress(frame_idx, total_frames, start_time)
                     if progress_callback:
                         progress_callback(frame_idx, total_frames, len(self.events))
     
+    def _submit_batch(
+        self,
+        infer: Optional[ThreadPoolExecutor],
+        pending: "deque",
+        frames: List[np.ndarray],
+        frame_indices: List[int],
+        timestamps: List[float],
+        video_writer,
+        fps: float,
+        total_frames: int,
+        progress_callback: Optional[callable],
+        start_time: float
+    ):
+        """
+        Start inference for a full batch, then post-process the previous
+        one (from `pending`) while it runs. Without an inference thread
+        (in-cabin) the batch is processed right away.
+        """
+        if infer is None:
+            self._process_frame_batch(
+                frames, frame_indices, timestamps, video_writer, fps,
+                total_frames, progress_callback, start_time
+            )
+            return
+        
+        pending.append((frames, frame_indices, timestamps, infer.submit(self._detect_batch, frames)))
+        if len(pending) > 1:
+            self._flush_batch(pending, video_writer, fps, total_frames, progress_callback, start_time)
+    
+    def _flush_batch(
+        self,
+        pending: "deque",
+        video_writer,
+        fps: float,
+        total_frames: int,
+        progress_callback: Optional[callable],
+        start_time: float
+    ):
+        """Post-process the oldest pending batch (dropped from the queue even if it fails)."""
+        frames, frame_indices, timestamps, detections = pending.popleft()
+        self._process_frame_batch(
+            frames, frame_indices, timestamps, video_writer, fps,
+            total_frames, progress_callback, start_time, detections=detections
+        )
+    
     def _process_dashcam_frame_with_detections(
         self,
         frame: np.ndarray,
         frame_idx: int,
         timestamp: float,
-        detections: List[Dict]
+        detections: List[Dict],
+        sign_detections: Optional[List[Dict]] = None
     ) -> Dict:
         """Process dashcam frame with pre-computed detections."""
         height, width = frame.shape[:2]
-        annotated = frame.copy()
         
-        # 1. Lane Detection
-        lane_result = self.lane_detector.process_frame(annotated)
+        # Hot path: bind per-frame values once instead of re-fetching them
+        events = self.events
+        time_s = round(timestamp, 2)
+        
+        # 1. Lane Detection (reads frame; its annotated_frame is always a
+        # new array, so every later overlay is drawn on it in place)
+        lane_result = self.lane_detector.process_frame(frame)
         annotated = lane_result['annotated_frame']
         
         if lane_result['is_departed']:
-            self.events.append({
+            events.append({
                 "frame": frame_idx,
-                "time": round(timestamp, 2),
+                "time": time_s,
                 "type": "lane_departure",
                 "level": "warning",
                 "data": {"direction": lane_result['departure_direction'], "offset": lane_result['offset']}
             })
         
         # 2. Object Detection (use pre-computed)
-        annotated = self.object_detector.draw_detections(annotated, detections)
-        front_vehicles = self.object_detector.filter_front_vehicles(detections, height)
-        closest = self.object_detector.get_closest_vehicle(front_vehicles)
+        object_detector = self.object_detector
+        annotated = object_detector.draw_detections(annotated, detections, inplace=True)
+        front_vehicles = object_detector.filter_front_vehicles(detections, height)
+        closest = object_detector.get_closest_vehicle(front_vehicles)
         
-        # 3. Distance & Collision
+        # 3. Distance & Collision: one batch pass over the front vehicles.
+        # Detections on this path carry no track ids, so risk comes from
+        # distance (no TTC)
         if closest:
-            dist_result = self.distance_estimator.estimate_distance(closest, height)
-            annotated = self.distance_estimator.draw_distance_info(
-                annotated, closest['bbox'], dist_result['distance_smoothed'],
-                dist_result['risk_level'], dist_result['ttc']
+            distance_estimator = self.distance_estimator
+            distance_estimator.process_tracked_objects(front_vehicles, height, frame_idx)
+            distance = closest['distance']
+            risk_level = closest['risk_level']
+            ttc = closest['ttc']
+            
+            annotated = distance_estimator.draw_distance_info(
+                annotated, closest['bbox'], distance, risk_level, ttc, inplace=True
             )
             
-            if dist_result['risk_level'] in ['DANGER', 'CAUTION']:
-                self.events.append({
-                    "frame": frame_idx, "time": round(timestamp, 2),
-                    "type": "collision_risk", "level": dist_result['risk_level'].lower(),
-                    "data": {"distance": dist_result['distance_smoothed'], "ttc": dist_result['ttc'], 
+            if risk_level in ('CRITICAL', 'DANGER', 'CAUTION'):
+                events.append({
+                    "frame": frame_idx, "time": time_s,
+                    "type": "collision_risk", "level": risk_level.lower(),
+                    "data": {"distance": distance, "ttc": ttc, 
                             "vehicle_type": closest['class_name']}
                 })
         
-        # 4. Traffic Signs
-        traffic_result = self.traffic_sign_detector.process_frame(annotated)
+        # 4. Traffic Signs (detected on the raw frame in the batch step)
+        traffic_result = self.traffic_sign_detector.process_frame(annotated, sign_detections, inplace=True)
         annotated = traffic_result['annotated_frame']
         
-        if traffic_result['critical_signs']:
-            for sign in traffic_result['critical_signs']:
-                self.events.append({
-                    "frame": frame_idx, "time": round(timestamp, 2),
-                    "type": "traffic_sign", "level": "info",
-                    "data": {"sign_type": sign['sign_type'], "confidence": sign['confidence']}
-                })
+        for sign in traffic_result['critical_signs']:
+            events.append({
+                "frame": frame_idx, "time": time_s,
+                "type": "traffic_sign", "level": "info",
+                "data": {"sign_type": sign['sign_type'], "confidence": sign['confidence']}
+            })
         
         return {
             "annotated_frame": annotated,
@@ -265,15 +592,35 @@ class VideoPipelineV11:
             "traffic_signs": traffic_result
         }
     
-    def _log_progress(self, frame_idx: int, total_frames: int, start_time: datetime):
-        """Log processing progress."""
-        elapsed = (datetime.now() - start_time).total_seconds()
+    def _log_progress(self, frame_idx: int, total_frames: int, start_time: float):
+        """
+        Log processing progress.
+        
+        fps and ETA come from an EMA of per-frame latency (decay
+        LATENCY_EMA_DECAY per frame) rather than the whole-run average, so
+        they follow slow-downs (dense traffic, thermal throttling) instead
+        of lagging behind them.
+        """
+        now = time.perf_counter()
         progress_pct = (frame_idx / total_frames) * 100
         
-        if elapsed > 0:
-            fps_processing = frame_idx / elapsed
-            remaining_frames = total_frames - frame_idx
-            eta_seconds = remaining_frames / fps_processing if fps_processing > 0 else 0
+        # n frames since the last call share one measured mean latency, so
+        # the n per-frame EMA updates collapse to a single closed-form step
+        # with weight 1 - decay**n
+        last_time, last_idx = self._progress_mark or (start_time, 0)
+        frames = frame_idx - last_idx
+        if frames > 0:
+            latency = (now - last_time) / frames
+            if self._ema_latency is None:
+                self._ema_latency = latency
+            else:
+                weight = 1.0 - self.LATENCY_EMA_DECAY ** frames
+                self._ema_latency += weight * (latency - self._ema_latency)
+        self._progress_mark = (now, frame_idx)
+        
+        if self._ema_latency:
+            fps_processing = 1.0 / self._ema_latency
+            eta_seconds = (total_frames - frame_idx) * self._ema_latency
             eta_str = f"{int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
         else:
             fps_processing = 0
@@ -417,26 +764,124 @@ class VideoPipelineV11:
         driver_result = self.driver_monitor.process_frame(frame)
         annotated = driver_result['annotated_frame']
         
-        # Log drowsiness events
+        # Log drowsiness events only when the reason changes, or every
+        # DROWSY_EVENT_INTERVAL frames while it persists (not every frame)
         if driver_result['is_drowsy']:
-            event = {
-                "frame": frame_idx,
-                "time": round(timestamp, 2),
-                "type": "driver_drowsy",
-                "level": "danger",
-                "data": {
-                    "reason": driver_result['drowsy_reason'],
-                    "ear": driver_result['ear'],
-                    "mar": driver_result['mar']
+            reason = driver_result['drowsy_reason']
+            if (reason != self._last_drowsy_reason or
+                    frame_idx - self._last_drowsy_event_frame >= self.DROWSY_EVENT_INTERVAL):
+                event = {
+                    "frame": frame_idx,
+                    "time": round(timestamp, 2),
+                    "type": "driver_drowsy",
+                    "level": "danger",
+                    "data": {
+                        "reason": reason,
+                        "ear": driver_result['ear'],
+                        "mar": driver_result['mar']
+                    }
                 }
-            }
-            self.events.append(event)
+                self.events.append(event)
+                self._last_drowsy_reason = reason
+                self._last_drowsy_event_frame = frame_idx
+        else:
+            self._last_drowsy_reason = None
         
         return {
             "annotated_frame": annotated,
             "driver": driver_result
         }
     
+    def warmup(self):
+        """
+        Run one dummy batch through the YOLO model.
+        
+        The first inference pays for CUDA context setup, cuDNN autotuning
+        and layer fusion; doing it here keeps that off the first real job.
+        """
+        if self.object_detector is None:
+            return
+        
+        size = self.INFERENCE_IMGSZ
+        dummy = np.zeros((size, size, 3), dtype=np.uint8)
+        try:
+            self.object_detector.predict_batch([dummy] * self.batch_size)
+            logger.info(f"🔥 YOLO warmed up on {self.device}")
+        except Exception as e:
+            logger.warning(f"YOLO warmup failed: {e}")
+    
+    def reset_state(self):
+        """
+        Clear per-video state so a cached pipeline can process a new video.
+        
+        YOLO weights are kept; lightweight stateful helpers are rebuilt,
+        trackers, counters and the driver monitor's temporal state are cleared.
+        """
+        self.events = []
+        self._last_drowsy_reason = None
+        self._last_drowsy_event_frame = -self.DROWSY_EVENT_INTERVAL
+        
+        if self.video_type == "dashcam":
+            # Pure OpenCV/NumPy modules: cheap to rebuild
+            self.lane_detector = LaneDetectorV11(device=self.device)
+            self.distance_estimator = DistanceEstimator()
+            
+            signs = self.traffic_sign_detector
+            signs.current_speed_limit = None
+            signs.speed_limit_confidence = 0.0
+            if signs.tracker is not None:
+                signs.tracker.reset()
+            
+            # Track ids / velocity history must not carry into the next video
+            if self.object_detector.tracker is not None:
+                self.object_detector.tracker.reset()
+        else:
+            # Counters, temporal window, alert cooldowns and FaceMesh tracking
+            self.driver_monitor.reset()
+        
+        if self._probe_monitor is not None:
+            self._probe_monitor.reset()
+    
+    def _open_capture(self, input_path: str) -> cv2.VideoCapture:
+        """
+        Open video for decoding.
+        
+        On GPU hosts, prefer cv2.cudacodec (NVDEC decode + GPU BGR->RGB) when
+        OpenCV is built with CUDA, otherwise ask the FFmpeg backend for
+        hardware decode (NVDEC / VAAPI / D3D11) so H.264/H.265 decode does
+        not compete with the pipeline for CPU. Falls back to the default
+        software decoder: PyAV when installed (threaded decode straight
+        to RGB), else OpenCV's FFmpeg backend.
+        """
+        if (self.device == "cuda" and hasattr(cv2, "cudacodec")
+                and cv2.cuda.getCudaEnabledDeviceCount() > 0):
+            try:
+                cap = _CudaCodecCapture(input_path)
+                if cap.isOpened():
+                    return cap
+                cap.release()
+            except cv2.error as e:
+                logger.info(f"cudacodec decode unavailable ({e}), trying FFmpeg hwaccel")
+        
+        if self.device == "cuda" and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            cap = cv2.VideoCapture(
+                input_path,
+                cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+            )
+            if cap.isOpened():
+                return cap
+            cap.release()
+            logger.info("Hardware video decode unavailable, using software decoder")
+        
+        if av is not None:
+            try:
+                return _PyAVCapture(input_path, max_width=self.MAX_DECODE_WIDTH)
+            except (av.error.FFmpegError, IndexError) as e:
+                logger.info(f"PyAV decode unavailable ({e}), using OpenCV decoder")
+        
+        return cv2.VideoCapture(input_path)
+    
     def process_video(
         self, 
         input_path: str, 
@@ -462,7 +907,7 @@ class VideoPipelineV11:
         logger.info(f"Video type: {self.video_type}")
         
         # Open video
-        cap = cv2.VideoCapture(input_path)
+        cap = self._open_capture(input_path)
         
         if not cap.isOpened():
             logger.error(f"Failed to open video: {input_path}")
@@ -488,6 +933,14 @@ class VideoPipelineV11:
         
         logger.info(f"Video properties: {width}x{height} @ {fps} fps, {total_frames} frames")
         
+        # Frames may be downscaled on decode: the pinhole focal length is in
+        # pixels of the processed frame
+        scale = getattr(cap, "scale", 1.0)
+        if scale != 1.0:
+            logger.info(f"Decoding downscaled by {scale:.2f}")
+        if self.distance_estimator is not None:
+            self.distance_estimator.focal_length = DistanceEstimator.DEFAULT_FOCAL_LENGTH * scale
+        
         # Create video writer
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
         out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
@@ -500,77 +953,131 @@ class VideoPipelineV11:
                 "error": "Failed to create output video file. Check disk space and permissions."
             }
         
+        # Encode on a background thread (takes RGB frames)
+        out = _AsyncVideoWriter(out)
+        
         # Reset events
         self.events = []
+        self._last_drowsy_reason = None
+        self._last_drowsy_event_frame = -self.DROWSY_EVENT_INTERVAL
         
         # Process frames
         frame_idx = 0
         processed_frames = 0
-        start_time = datetime.now()
-        last_log_time = start_time
+        # Monotonic: wall-clock adjustments must not skew fps/ETA
+        start_time = time.perf_counter()
+        self._progress_mark = None
+        self._ema_latency = None
         
         # PRODUCTION OPTIMIZATION: Batch frame buffer
         frame_buffer = []
         frame_indices = []
         frame_timestamps = []
         
+        # Dashcam YOLO runs on its own thread: batch k+1 is inferred while
+        # batch k goes through lane detection, drawing and events here.
+        # The model is only ever called from this one thread.
+        infer = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="video-infer")
+            if self.video_type == "dashcam" else None
+        )
+        pending = deque()  # (frames, indices, timestamps, detections) to post-process
+        
+        # Decode on a background thread so it overlaps inference. Frames
+        # are decoded into a preallocated ring: the decoder can be at most
+        # PREFETCH_FRAMES queued + 1 in flight ahead of the batches being
+        # processed (one post-processing, one in inference), so a ring of
+        # that size + 2 * batch_size is never overwritten while still in use.
+        alloc_frame = getattr(
+            cap, "alloc_frame",
+            lambda h, w: np.empty((h, w, 3), dtype=np.uint8)
+        )
+        ring = [
+            alloc_frame(height, width)
+            for _ in range(self.PREFETCH_FRAMES + 2 * self.batch_size + 1)
+        ]
+        frame_queue = queue.Queue(maxsize=self.PREFETCH_FRAMES)
+        stop_decoding = threading.Event()
+        decoder = threading.Thread(
+            target=self._decode_frames,
+            args=(cap, ring, frame_queue, stop_decoding),
+            name="video-decode",
+            daemon=True
+        )
+        decoder.start()
+        
         logger.info(f"🎬 Starting video processing: {total_frames} frames @ {fps:.1f} fps (batch_size={self.batch_size})")
         
-        while True:
-            ret, frame = cap.read()
-            
-            if not ret:
-                # Process remaining frames in buffer
-                if frame_buffer:
-                    self._process_frame_batch(
-                        frame_buffer, frame_indices, frame_timestamps, 
-                        out, fps, total_frames, progress_callback, start_time
-                    )
-                break
-            
-            try:
-                # Convert BGR to RGB
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Calculate timestamp
-                timestamp = frame_idx / fps
-                
-                # Add to batch buffer
-                frame_buffer.append(rgb_frame)
-                frame_indices.append(frame_idx)
-                frame_timestamps.append(timestamp)
+        try:
+            while True:
+                rgb_frame = frame_queue.get()
                 
-                frame_idx += 1
+                if rgb_frame is None:
+                    # Process remaining frames in buffer (a failing batch is
+                    # logged and dropped, like mid-stream ones)
+                    try:
+                        if frame_buffer:
+                            self._submit_batch(
+                                infer, pending, frame_buffer, frame_indices, frame_timestamps,
+                                out, fps, total_frames, progress_callback, start_time
+                            )
+                    except Exception as e:
+                        logger.error(f"❌ Error processing frames up to {frame_idx - 1}: {e}")
+                    while pending:
+                        try:
+                            self._flush_batch(pending, out, fps, total_frames, progress_callback, start_time)
+                        except Exception as e:
+                            logger.error(f"❌ Error processing frames up to {frame_idx - 1}: {e}")
+                    break
                 
-                # Process batch when buffer is full
-                if len(frame_buffer) >= self.batch_size:
-                    self._process_frame_batch(
-                        frame_buffer, frame_indices, frame_timestamps,
-                        out, fps, total_frames, progress_callback, start_time
-                    )
-                    processed_frames += len(frame_buffer)
+                try:
+                    # Calculate timestamp
+                    timestamp = frame_idx / fps
                     
-                    # Clear buffer
-                    frame_buffer = []
-                    frame_indices = []
-                    frame_timestamps = []
-                
-            except Exception as e:
-                logger.error(f"❌ Error processing frame {frame_idx}: {e}")
-                # Continue with next frame instead of crashing
-                frame_idx += 1
-                continue
-        
-        # Release resources
-        cap.release()
-        out.release()
+                    # Add to batch buffer
+                    frame_buffer.append(rgb_frame)
+                    frame_indices.append(frame_idx)
+                    frame_timestamps.append(timestamp)
+                    
+                    frame_idx += 1
+                    
+                    # Process batch when buffer is full
+                    if len(frame_buffer) >= self.batch_size:
+                        try:
+                            self._submit_batch(
+                                infer, pending, frame_buffer, frame_indices, frame_timestamps,
+                                out, fps, total_frames, progress_callback, start_time
+                            )
+                        finally:
+                            # The lists now belong to the submitted batch (it
+                            # may be queued in `pending` even if this raised):
+                            # start new ones rather than appending to them
+                            processed_frames += len(frame_buffer)
+                            frame_buffer = []
+                            frame_indices = []
+                            frame_timestamps = []
+                    
+                except Exception as e:
+                    logger.error(f"❌ Error processing frames up to {frame_idx - 1}: {e}")
+                    # Continue with next frame instead of crashing
+                    continue
+        finally:
+            if infer is not None:
+                infer.shutdown(wait=True)
+            
+            # Unblocks the decoder if we bail out before end of stream
+            stop_decoding.set()
+            decoder.join()
+            
+            # Release resources (flushes frames still queued for encoding)
+            cap.release()
+            out.release()
         
         # Add remaining frames to processed count
         processed_frames = frame_idx
         
         # Calculate stats
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         stats = {
             "total_frames": total_frames,
@@ -594,31 +1101,95 @@ class VideoPipelineV11:
         }
 
 
+# Idle pipelines keyed by (device, video_type). Model weights are loaded once
+# per pipeline and reused across jobs; each pipeline is checked out by one
+# job at a time because its modules keep per-video state.
+_pipeline_pool: Dict[Tuple[str, str], List[VideoPipelineV11]] = {}
+_pipeline_pool_lock = threading.Lock()
+
+# Idle pipelines kept per (device, video_type); extras are dropped on release
+# so a burst of concurrent jobs doesn't pin one model copy per job forever
+PIPELINE_POOL_MAX_IDLE = 2
+
+
+def _acquire_pipeline(device: str, video_type: str) -> VideoPipelineV11:
+    """Take an idle cached pipeline, or build one if none is free."""
+    with _pipeline_pool_lock:
+        idle = _pipeline_pool.get((device, video_type))
+        if idle:
+            pipeline = idle.pop()
+            logger.info(f"Reusing cached VideoPipelineV11 ({video_type} on {device})")
+            return pipeline
+    
+    return VideoPipelineV11(device=device, video_type=video_type)
+
+
+def _release_pipeline(pipeline: VideoPipelineV11, device: str, video_type: str):
+    """Return a pipeline to the pool after a job (dropped if the pool is full)."""
+    pipeline.reset_state()
+    with _pipeline_pool_lock:
+        idle = _pipeline_pool.setdefault((device, video_type), [])
+        if len(idle) < PIPELINE_POOL_MAX_IDLE:
+            idle.append(pipeline)
+            return
+    logger.info(f"Pipeline pool full, dropping VideoPipelineV11 ({video_type} on {device})")
+
+
+def preload_pipelines(device: str, video_types: Tuple[str, ...] = ("dashcam",)):
+    """
+    Build and warm one pipeline per video type into the pool at startup,
+    so the first job doesn't load weights or hit cold CUDA kernels.
+    
+    Args:
+        device: "cuda" or "cpu"
+        video_types: Pipeline types to preload
+    """
+    for video_type in video_types:
+        with _pipeline_pool_lock:
+            if _pipeline_pool.get((device, video_type)):
+                continue
+        
+        pipeline = VideoPipelineV11(device=device, video_type=video_type)
+        pipeline.warmup()
+        
+        with _pipeline_pool_lock:
+            _pipeline_pool.setdefault((device, video_type), []).append(pipeline)
+        logger.info(f"Preloaded VideoPipelineV11 ({video_type} on {device})")
+
+
 def process_video(
     input_path: str,
     output_path: str,
     video_type: str = "dashcam",
-    device: str = "cpu"
+    device: str = "cpu",
+    progress_callback: Optional[callable] = None
 ) -> Dict:
     """
     Main entry point for video processing.
     Backend calls THIS FUNCTION ONLY.
     
+    Pipelines (and their model weights) are cached per (device, video_type)
+    and reused by later calls instead of being reloaded per video.
+    
     Args:
         input_path: Path to input video
         output_path: Path to save processed video
         video_type: "dashcam" or "in_cabin"
         device: "cuda" or "cpu"
+        progress_callback: Optional callback(frame_idx, total_frames, events)
         
     Returns:
         Dict with processing results
     """
     try:
-        # Create pipeline
-        pipeline = VideoPipelineV11(device=device, video_type=video_type)
+        # Get cached pipeline (loads models only on first use)
+        pipeline = _acquire_pipeline(device, video_type)
         
-        # Process video
-        result = pipeline.process_video(input_path, output_path)
+        try:
+            # Process video
+            result = pipeline.process_video(input_path, output_path, progress_callback)
+        finally:
+            _release_pipeline(pipeline, device, video_type)
         
         return result
         
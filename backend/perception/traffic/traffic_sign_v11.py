@@ -33,6 +33,8 @@ from typing import List, Dict, Optional, Tuple, Any
 from collections import deque
 import logging
 
+from ..object.object_detector_v11 import resolve_yolo_weights
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +44,10 @@ class SignTracker:
     Uses spatial and temporal consistency.
     """
     
+    # Sign slot capacity (signs expire after persistence_frames, so only a
+    # few are ever live)
+    MAX_SIGNS = 64
+    
     def __init__(self, persistence_frames: int = 90, iou_threshold: float = 0.5):
         """
         Initialize sign tracker.
@@ -53,33 +59,66 @@ class SignTracker:
         self.persistence_frames = persistence_frames
         self.iou_threshold = iou_threshold
         
-        # Tracked signs: {sign_id: {'bbox', 'type', 'last_seen', 'count', 'speed_limit'}}
-        self.tracked_signs = {}
+        # Tracked signs (struct-of-arrays slot pool): slot i is live when
+        # _active[i]; ids grow monotonically, so they also give first-seen order
+        self._free_slots = list(range(self.MAX_SIGNS - 1, -1, -1))
+        self._active = np.zeros(self.MAX_SIGNS, dtype=bool)
+        self._ids = np.zeros(self.MAX_SIGNS, dtype=np.int64)
+        self._boxes = np.zeros((self.MAX_SIGNS, 4), dtype=np.float64)
+        self._types = np.full(self.MAX_SIGNS, None, dtype=object)
+        self._last_seen = np.zeros(self.MAX_SIGNS, dtype=np.int64)
+        self._count = np.zeros(self.MAX_SIGNS, dtype=np.int32)
+        self._speed_limit = np.full(self.MAX_SIGNS, None, dtype=object)
         self.next_sign_id = 1
         self.frame_number = 0
     
-    def _iou(self, bbox1: List[int], bbox2: List[int]) -> float:
-        """Calculate Intersection over Union between two bboxes."""
-        x1_1, y1_1, x2_1, y2_1 = bbox1
-        x1_2, y1_2, x2_2, y2_2 = bbox2
+    def reset(self):
+        """Forget all tracked signs (new video)."""
+        self._free_slots = list(range(self.MAX_SIGNS - 1, -1, -1))
+        self._active[:] = False
+        self.next_sign_id = 1
+        self.frame_number = 0
+    
+    def _iou(self, bbox: List[int], boxes: np.ndarray) -> np.ndarray:
+        """Calculate Intersection over Union between one bbox and (K, 4) bboxes."""
+        x1_1, y1_1, x2_1, y2_1 = bbox
         
         # Intersection
-        x1_i = max(x1_1, x1_2)
-        y1_i = max(y1_1, y1_2)
-        x2_i = min(x2_1, x2_2)
-        y2_i = min(y2_1, y2_2)
-        
-        if x2_i < x1_i or y2_i < y1_i:
-            return 0.0
+        x1_i = np.maximum(x1_1, boxes[:, 0])
+        y1_i = np.maximum(y1_1, boxes[:, 1])
+        x2_i = np.minimum(x2_1, boxes[:, 2])
+        y2_i = np.minimum(y2_1, boxes[:, 3])
         
-        intersection = (x2_i - x1_i) * (y2_i - y1_i)
+        intersection = np.clip(x2_i - x1_i, 0, None) * np.clip(y2_i - y1_i, 0, None)
         
         # Union
         area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
+        area2 = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
         union = area1 + area2 - intersection
         
-        return intersection / union if union > 0 else 0.0
+        iou = np.zeros(len(boxes))
+        np.divide(intersection, union, out=iou, where=union > 0)
+        return iou
+    
+    def _match(self, bbox: List[int], sign_type: str) -> Optional[int]:
+        """Slot of the earliest tracked sign of this type overlapping bbox, if any."""
+        candidates = np.flatnonzero(self._active & (self._types == sign_type))
+        if candidates.size == 0:
+            return None
+        
+        hits = candidates[self._iou(bbox, self._boxes[candidates]) >= self.iou_threshold]
+        if hits.size == 0:
+            return None
+        return int(hits[np.argmin(self._ids[hits])])
+    
+    def _allocate_slot(self) -> int:
+        """Take a free slot; if none, drop the least recently seen sign."""
+        if not self._free_slots:
+            live = np.flatnonzero(self._active)
+            oldest = int(live[np.argmin(self._last_seen[live])])
+            self._active[oldest] = False
+            self._free_slots.append(oldest)
+        return self._free_slots.pop()
     
     def update(self, detections: List[Dict]) -> List[Dict]:
         """
@@ -99,31 +138,26 @@ class SignTracker:
             sign_type = detection['sign_type']
             
             # Check if matches existing sign
-            matched_id = None
-            for sign_id, sign_data in self.tracked_signs.items():
-                if sign_data['type'] == sign_type:
-                    iou = self._iou(bbox, sign_data['bbox'])
-                    if iou >= self.iou_threshold:
-                        matched_id = sign_id
-                        break
+            slot = self._match(bbox, sign_type)
             
-            if matched_id:
+            if slot is not None:
                 # Update existing sign
-                self.tracked_signs[matched_id]['last_seen'] = self.frame_number
-                self.tracked_signs[matched_id]['count'] += 1
-                self.tracked_signs[matched_id]['bbox'] = bbox  # Update position
+                self._last_seen[slot] = self.frame_number
+                self._count[slot] += 1
+                self._boxes[slot] = bbox  # Update position
             else:
                 # New sign
                 sign_id = self.next_sign_id
                 self.next_sign_id += 1
                 
-                self.tracked_signs[sign_id] = {
-                    'bbox': bbox,
-                    'type': sign_type,
-                    'last_seen': self.frame_number,
-                    'count': 1,
-                    'speed_limit': detection.get('speed_limit')
-                }
+                slot = self._allocate_slot()
+                self._active[slot] = True
+                self._ids[slot] = sign_id
+                self._boxes[slot] = bbox
+                self._types[slot] = sign_type
+                self._last_seen[slot] = self.frame_number
+                self._count[slot] = 1
+                self._speed_limit[slot] = detection.get('speed_limit')
                 
                 # Add sign ID to detection
                 detection['sign_id'] = sign_id
@@ -131,13 +165,10 @@ class SignTracker:
                 new_signs.append(detection)
         
         # Remove old signs
-        to_remove = [
-            sign_id for sign_id, sign_data in self.tracked_signs.items()
-            if self.frame_number - sign_data['last_seen'] > self.persistence_frames
-        ]
-        
-        for sign_id in to_remove:
-            del self.tracked_signs[sign_id]
+        stale = self._active & (self.frame_number - self._last_seen > self.persistence_frames)
+        if stale.any():
+            self._active[stale] = False
+            self._free_slots.extend(np.flatnonzero(stale).tolist())
         
         return new_signs
 
@@ -171,7 +202,9 @@ class TrafficSignV11:
         model_path: str = None, 
         device: str = "cpu",
         conf_threshold: float = 0.4,
-        enable_tracking: bool = True
+        enable_tracking: bool = True,
+        shared_model=None,
+        imgsz: int = 640
     ):
         """
         Initialize traffic sign detector.
@@ -183,10 +216,19 @@ class TrafficSignV11:
             device: "cuda" or "cpu" for inference
             conf_threshold: Confidence threshold for detections
             enable_tracking: Enable sign tracking to avoid duplicates
+            shared_model: Already loaded COCO YOLO model (e.g. the object
+                       detector's) to reuse instead of loading the weights
+                       again. Ignored when model_path is given.
+            imgsz: Inference size (pixels, multiple of 32)
         """
         self.device = device
         self.conf_threshold = conf_threshold
+        self.imgsz = imgsz
         self.model = None
+        
+        # FP16 inference on GPU (T4 tensor cores): ~2x throughput, no
+        # meaningful mAP loss for detection. CPU stays FP32.
+        self.half = device == "cuda"
         self.is_custom_model = model_path is not None
         
         # Sign tracking (PRODUCTION)
@@ -197,6 +239,12 @@ class TrafficSignV11:
         self.current_speed_limit = None  # km/h
         self.speed_limit_confidence = 0.0
         
+        if shared_model is not None and not self.is_custom_model:
+            self.model = shared_model
+            logger.info("Traffic Sign Detector sharing the object detector's COCO model")
+            self._build_sign_classes()
+            return
+        
         # Try to load YOLOv11 model
         try:
             from ultralytics import YOLO
@@ -206,8 +254,10 @@ class TrafficSignV11:
                 model_path = "yolo11n.pt"  # COCO pretrained
                 logger.info("Using COCO pretrained model (limited to stop signs and traffic lights)")
             
+            model_path = resolve_yolo_weights(model_path, device)
             self.model = YOLO(model_path)
             logger.info(f"Traffic Sign Detector loaded from {model_path} on {device}")
+            self._build_sign_classes()
             
         except ImportError:
             logger.error("ultralytics package not installed. Install: pip install ultralytics")
@@ -216,6 +266,18 @@ class TrafficSignV11:
             logger.error(f"Failed to load YOLO model: {e}")
             raise
     
+    def _build_sign_classes(self):
+        """
+        Classify every class of the loaded model once:
+        {class_id: (class_name, sign_type, speed_limit)} for sign classes,
+        so per-box extraction is a single int lookup.
+        """
+        self._sign_classes = {}
+        for cls_id, cls_name in self.model.names.items():
+            sign_type, speed_limit = self.classify_sign(cls_name, cls_id)
+            if sign_type is not None:
+                self._sign_classes[cls_id] = (cls_name, sign_type, speed_limit)
+    
     def detect(self, frame: np.ndarray) -> List[Dict]:
         """
         Detect traffic signs in frame.
@@ -241,6 +303,8 @@ class TrafficSignV11:
                 frame, 
                 device=self.device,
                 conf=self.conf_threshold,
+                half=self.half,
+                imgsz=self.imgsz,
                 verbose=False
             )
             
@@ -248,33 +312,7 @@ class TrafficSignV11:
             
             # Extract detections
             for result in results:
-                boxes = result.boxes
-                
-                for box in boxes:
-                    # Get box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    conf = float(box.conf[0])
-                    cls_id = int(box.cls[0])
-                    
-                    # Get class name
-                    cls_name = result.names[cls_id]
-                    
-                    # Classify sign type
-                    sign_type, speed_limit = self.classify_sign(cls_name, cls_id)
-                    
-                    if sign_type is None:
-                        continue  # Not a traffic sign
-                    
-                    detection = {
-                        "class_id": cls_id,
-                        "class_name": cls_name,
-                        "sign_type": sign_type,
-                        "confidence": conf,
-                        "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                        "speed_limit": speed_limit  # None if not a speed limit sign
-                    }
-                    
-                    detections.append(detection)
+                detections.extend(self._extract_signs(result))
             
             return detections
             
@@ -282,6 +320,86 @@ class TrafficSignV11:
             logger.error(f"Detection failed: {e}")
             return []
     
+    def detect_batch(self, frames: List[np.ndarray]) -> List[List[Dict]]:
+        """
+        Batch sign detection: one YOLO call for several frames.
+        
+        Args:
+            frames: List of RGB frames
+            
+        Returns:
+            List of sign detection lists (one per frame)
+        """
+        if self.model is None:
+            logger.warning("Model not loaded")
+            return [[] for _ in frames]
+        
+        if not frames:
+            return []
+        
+        try:
+            results = self.model(
+                frames,
+                device=self.device,
+                conf=self.conf_threshold,
+                half=self.half,
+                imgsz=self.imgsz,
+                verbose=False
+            )
+            return [self._extract_signs(result) for result in results]
+            
+        except Exception as e:
+            logger.error(f"Batch detection failed: {e}")
+            return [[] for _ in frames]
+    
+    def signs_from_results(self, results) -> List[List[Dict]]:
+        """
+        Sign detections from YOLO results produced by a shared COCO model
+        (one list per frame). The shared pass may run at a lower confidence
+        threshold, so boxes under conf_threshold are dropped here.
+        """
+        return [self._extract_signs(result) for result in results]
+    
+    def _extract_signs(self, result) -> List[Dict]:
+        """
+        Convert one YOLO result into sign detection dicts.
+        
+        Box tensors are copied to host once per result rather than per box.
+        """
+        boxes = result.boxes
+        if len(boxes) == 0:
+            return []
+        
+        sign_classes = self._sign_classes
+        cls_ids = boxes.cls.cpu().numpy().astype(np.int32)
+        confs = boxes.conf.cpu().numpy()
+        
+        # Traffic sign classes above the confidence threshold
+        keep = np.fromiter(
+            (cls_id in sign_classes for cls_id in cls_ids.tolist()),
+            dtype=bool, count=len(cls_ids)
+        ) & (confs >= self.conf_threshold)
+        if not keep.any():
+            return []
+        
+        xyxy = boxes.xyxy.cpu().numpy()[keep].astype(np.int32)
+        
+        detections = []
+        for cls_id, conf, bbox in zip(
+            cls_ids[keep].tolist(), confs[keep].tolist(), xyxy.tolist()
+        ):
+            cls_name, sign_type, speed_limit = sign_classes[cls_id]
+            detections.append({
+                "class_id": cls_id,
+                "class_name": cls_name,
+                "sign_type": sign_type,
+                "confidence": conf,
+                "bbox": bbox,
+                "speed_limit": speed_limit  # None if not a speed limit sign
+            })
+        
+        return detections
+    
     def classify_sign(self, class_name: str, class_id: int) -> Tuple[Optional[str], Optional[int]]:
         """
         Classify detected object as traffic sign type (Vietnamese context).
@@ -339,18 +457,19 @@ class TrafficSignV11:
         
         return actions.get(sign_type, 'OBSERVE SIGN')
     
-    def draw_signs(self, frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
+    def draw_signs(self, frame: np.ndarray, detections: List[Dict], inplace: bool = False) -> np.ndarray:
         """
         Draw traffic sign detections on frame.
         
         Args:
             frame: RGB frame
             detections: List of sign detections
+            inplace: Draw on frame itself instead of a copy
             
         Returns:
             Annotated frame
         """
-        annotated = frame.copy()
+        annotated = frame if inplace else frame.copy()
         
         for det in detections:
             x1, y1, x2, y2 = det['bbox']
@@ -496,7 +615,7 @@ class TrafficSignV11:
         ]
         
         # Draw detections
-        annotated_frame = self.draw_signs(frame, detections)
+        annotated_frame = self.draw_signs(frame, detections, inplace=inplace)
         
         # Add speed limit overlay
         if self.current_speed_limit:
@@ -532,12 +651,20 @@ class TrafficSignV11:
             "speed_violation": speed_violation
         }
     
-    def process_frame(self, frame: np.ndarray) -> Dict:
+    def process_frame(
+        self,
+        frame: np.ndarray,
+        detections: Optional[List[Dict]] = None,
+        inplace: bool = False
+    ) -> Dict:
         """
         Process frame for traffic sign recognition.
         
         Args:
             frame: RGB frame from video
+            detections: Pre-computed sign detections (e.g. from detect_batch);
+                        detected here when None
+            inplace: Draw overlays on frame itself instead of a copy
             
         Returns:
             Dict containing:
@@ -547,7 +674,8 @@ class TrafficSignV11:
                 - critical_signs: List of critical signs (STOP, etc.)
         """
         # Detect signs
-        detections = self.detect(frame)
+        if detections is None:
+            detections = self.detect(frame)
         
         # Identify critical signs
         critical_types = ['STOP', 'YIELD', 'NO_ENTRY']
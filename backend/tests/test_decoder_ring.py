@@ -0,0 +1,124 @@
+"""
+Decoder ring tests
+==================
+VideoPipelineV11._decode_frames decodes into a preallocated ring of frame
+buffers on a background thread. Frames handed out must arrive in order,
+converted to RGB, and must not be overwritten while process_video can
+still hold them.
+"""
+
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+from perception.pipeline.video_pipeline_v11 import VideoPipelineV11
+
+HEIGHT, WIDTH = 4, 6
+
+
+class FakeCapture:
+    """Writes frame i as BGR pixels (i, i + 1, i + 2) mod 256, like cap.read(dst)."""
+
+    def __init__(self, n_frames, yields_rgb=False, fail_at=None):
+        self.n_frames = n_frames
+        self.yields_rgb = yields_rgb
+        self.fail_at = fail_at
+        self.index = 0
+
+    def read(self, dst):
+        if self.index == self.fail_at:
+            raise RuntimeError("corrupt packet")
+        if self.index >= self.n_frames:
+            return False, None
+        i = self.index
+        self.index += 1
+        dst[:] = np.array([i, i + 1, i + 2], dtype=np.uint16) % 256
+        return True, dst
+
+
+def start_decoder(cap, ring_size, queue_size):
+    pipeline = VideoPipelineV11.__new__(VideoPipelineV11)
+    ring = [np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8) for _ in range(ring_size)]
+    frame_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=pipeline._decode_frames, args=(cap, ring, frame_queue, stop), daemon=True
+    )
+    thread.start()
+    return ring, frame_queue, stop, thread
+
+
+def expected_pixel(i, rgb=True):
+    bgr = [(i + k) % 256 for k in range(3)]
+    return bgr[::-1] if rgb else bgr
+
+
+def drain(frame_queue):
+    frames = []
+    while True:
+        frame = frame_queue.get(timeout=5)
+        if frame is None:
+            return frames
+        frames.append(frame.copy())
+
+
+def test_frames_arrive_in_order_as_rgb():
+    ring, frame_queue, _, thread = start_decoder(FakeCapture(50), ring_size=8, queue_size=4)
+    frames = drain(frame_queue)
+    thread.join(timeout=5)
+
+    assert len(frames) == 50
+    for i, frame in enumerate(frames):
+        assert frame[0, 0].tolist() == expected_pixel(i)
+
+
+def test_rgb_capture_decodes_straight_into_the_ring():
+    ring, frame_queue, _, thread = start_decoder(FakeCapture(20, yields_rgb=True), ring_size=5, queue_size=2)
+    for i in range(20):
+        frame = frame_queue.get(timeout=5)
+        # No conversion pass: the ring slot itself is handed out
+        assert frame is ring[i % len(ring)]
+        assert frame[0, 0].tolist() == expected_pixel(i, rgb=False)
+    assert frame_queue.get(timeout=5) is None
+    thread.join(timeout=5)
+
+
+def test_held_frames_are_not_overwritten():
+    # Same sizing rule as process_video: queued + one in flight, plus the
+    # batch being post-processed and the batch in inference
+    prefetch, batch_size = VideoPipelineV11.PREFETCH_FRAMES, 4
+    ring_size = prefetch + 2 * batch_size + 1
+    _, frame_queue, _, thread = start_decoder(FakeCapture(500), ring_size, prefetch)
+
+    held = deque()
+    count = 0
+    while True:
+        frame = frame_queue.get(timeout=5)
+        if frame is None:
+            break
+        held.append((count, frame))
+        count += 1
+        if len(held) > 2 * batch_size:
+            i, old = held.popleft()
+            assert old[0, 0].tolist() == expected_pixel(i)
+    for i, old in held:
+        assert old[0, 0].tolist() == expected_pixel(i)
+    assert count == 500
+    thread.join(timeout=5)
+
+
+def test_stop_ends_a_blocked_decoder():
+    _, frame_queue, stop, thread = start_decoder(FakeCapture(1000), ring_size=4, queue_size=2)
+    frame_queue.get(timeout=5)
+    stop.set()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_decode_error_still_ends_the_stream():
+    _, frame_queue, _, thread = start_decoder(FakeCapture(10, fail_at=3), ring_size=4, queue_size=2)
+    frames = drain(frame_queue)
+    thread.join(timeout=5)
+    assert [f[0, 0].tolist() for f in frames] == [expected_pixel(i) for i in range(3)]
@@ -0,0 +1,138 @@
+"""
+DetectionStore tests
+====================
+The store must behave exactly like the plain List[Detection] it replaced,
+so every check compares it against a list-based reference.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from app.models import Detection, DetectionStore
+
+
+CLASSES = ["car", "person", "truck", "bicycle", "bus"]
+CAMERAS = [None, "cam-1", "cam-2", "cam-3"]
+VIDEOS = [None, 1, 2, 3]
+
+
+def make_detections(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        Detection(
+            id=i,
+            class_name=rng.choice(CLASSES),
+            class_id=0,
+            confidence=round(rng.uniform(0.1, 1.0), 3),
+            bbox=[0.0, 0.0, 1.0, 1.0],
+            timestamp="2025-01-01T00:00:00",
+            camera_id=rng.choice(CAMERAS),
+            video_id=rng.choice(VIDEOS),
+        )
+        for i in range(n)
+    ]
+
+
+def reference_class_stats(items):
+    counts, sums, order = Counter(), Counter(), []
+    for det in items:
+        if det.class_name not in counts:
+            order.append(det.class_name)
+        counts[det.class_name] += 1
+        sums[det.class_name] += det.confidence
+    return [(name, counts[name], sums[name]) for name in order]
+
+
+def reference_camera_counts(items):
+    counts = Counter(det.camera_id for det in items if det.camera_id)
+    return list(counts.items())
+
+
+def reference_select(items, camera_id=None, class_name=None):
+    return [
+        det for det in items
+        if (not camera_id or det.camera_id == camera_id)
+        and (not class_name or det.class_name == class_name)
+    ]
+
+
+def assert_matches(store, items):
+    assert len(store) == len(items)
+    assert list(store) == items
+    assert store.copy() == items
+
+    stats = store.class_stats()
+    expected = reference_class_stats(items)
+    assert [(name, count) for name, count, _ in stats] == [(name, count) for name, count, _ in expected]
+    for (_, _, got), (_, _, want) in zip(stats, expected):
+        assert got == pytest.approx(want)
+
+    assert store.camera_counts() == reference_camera_counts(items)
+
+    for camera_id in CAMERAS + ["unknown-cam"]:
+        for class_name in [None, "unknown-class"] + CLASSES:
+            assert store.select(camera_id, class_name) == reference_select(items, camera_id, class_name)
+
+
+def test_empty_store():
+    store = DetectionStore()
+    assert_matches(store, [])
+    assert store.remove_video(1) == 0
+
+
+def test_unknown_camera_and_class_select_nothing():
+    items = make_detections(50)
+    store = DetectionStore(items)
+    assert store.select(camera_id="unknown-cam") == []
+    assert store.select(class_name="unknown-class") == []
+    assert store.select(camera_id="cam-1", class_name="unknown-class") == []
+
+
+def test_growth_past_initial_capacity():
+    items = make_detections(3 * DetectionStore._INITIAL_CAPACITY + 7)
+    store = DetectionStore()
+    for det in items:
+        store.append(det)
+    assert_matches(store, items)
+
+
+@pytest.mark.parametrize("n", [0, 10, 2 * DetectionStore._INITIAL_CAPACITY + 1])
+def test_remove_video_matches_list_filter(n):
+    items = make_detections(n, seed=n)
+    store = DetectionStore(items)
+
+    for video_id in [2, 99, 1, 3]:
+        expected_removed = sum(det.video_id == video_id for det in items)
+        assert store.remove_video(video_id) == expected_removed
+        items = [det for det in items if det.video_id != video_id]
+        assert_matches(store, items)
+
+
+def test_append_after_remove_reuses_names():
+    items = make_detections(200, seed=1)
+    store = DetectionStore(items)
+    store.remove_video(1)
+    items = [det for det in items if det.video_id != 1]
+
+    extra = make_detections(300, seed=2)
+    for det in extra:
+        store.append(det)
+    assert_matches(store, items + extra)
+
+
+def test_removing_last_rows_of_a_class_drops_it():
+    only_bus = Detection(
+        id=1, class_name="bus", class_id=0, confidence=0.5, bbox=[0, 0, 1, 1],
+        timestamp="t", camera_id="cam-9", video_id=7,
+    )
+    items = make_detections(20, seed=3)
+    items = [det for det in items if det.class_name != "bus" and det.video_id != 7]
+    store = DetectionStore(items + [only_bus])
+
+    assert store.remove_video(7) == 1
+    assert "bus" not in [name for name, _, _ in store.class_stats()]
+    assert "cam-9" not in [camera_id for camera_id, _ in store.camera_counts()]
+    assert store.select(class_name="bus") == []
+    assert_matches(store, items)
@@ -0,0 +1,154 @@
+"""
+DistanceEstimator track history tests
+=====================================
+The struct-of-arrays history is checked against the per-track deque
+history it replaced, and the batch paths against the per-object ones.
+"""
+
+import random
+from collections import deque
+
+import numpy as np
+import pytest
+
+from perception.distance.distance_estimator import DistanceEstimator
+
+
+class DequeHistory:
+    """Reference: the original track_id -> deque of (distance, frame) history."""
+
+    def __init__(self, max_history=10, frame_rate=30.0):
+        self.max_history = max_history
+        self.frame_rate = frame_rate
+        self.track_history = {}
+
+    def estimate_velocity(self, track_id, distance, frame_number):
+        history = self.track_history.setdefault(track_id, deque(maxlen=self.max_history))
+        # The estimator stores distances as float32
+        history.append((float(np.float32(distance)), frame_number))
+        if len(history) < 2:
+            return 0.0, 0.0
+        dist_curr, frame_curr = history[-1]
+        dist_prev, frame_prev = history[-2]
+        dt = (frame_curr - frame_prev) / self.frame_rate
+        if dt == 0:
+            return 0.0, 0.0
+        velocity = (dist_curr - dist_prev) / dt
+        acceleration = 0.0
+        if len(history) >= 3:
+            dist_prev2, frame_prev2 = history[-3]
+            dt2 = (frame_prev - frame_prev2) / self.frame_rate
+            if dt2 > 0:
+                acceleration = (velocity - (dist_prev - dist_prev2) / dt2) / dt
+        return velocity, acceleration
+
+
+def random_track_frames(n_frames, n_tracks, seed):
+    """Per frame: a random subset of tracks with a drifting distance each."""
+    rng = random.Random(seed)
+    distances = {tid: rng.uniform(5, 80) for tid in range(n_tracks)}
+    for frame in range(1, n_frames + 1):
+        seen = rng.sample(range(n_tracks), rng.randint(0, n_tracks))
+        for tid in seen:
+            distances[tid] = min(200.0, max(1.0, distances[tid] + rng.uniform(-1.5, 1.5)))
+        yield frame, [(tid, distances[tid]) for tid in seen]
+
+
+def test_estimate_velocity_matches_deque_history():
+    estimator = DistanceEstimator()
+    reference = DequeHistory(estimator.max_history, estimator.frame_rate)
+    for frame, observations in random_track_frames(200, 12, seed=0):
+        for tid, distance in observations:
+            got = estimator.estimate_velocity(tid, distance, frame)
+            assert got == pytest.approx(reference.estimate_velocity(tid, distance, frame))
+
+
+def test_estimate_velocities_matches_per_track_path():
+    batch = DistanceEstimator()
+    single = DistanceEstimator()
+    for frame, observations in random_track_frames(200, 12, seed=1):
+        if not observations:
+            continue
+        track_ids = [tid for tid, _ in observations]
+        distances = np.array([d for _, d in observations])
+        velocities, accelerations = batch.estimate_velocities(track_ids, distances, frame)
+        expected = [single.estimate_velocity(tid, d, frame) for tid, d in observations]
+        np.testing.assert_allclose(velocities, [v for v, _ in expected], atol=1e-9)
+        np.testing.assert_allclose(accelerations, [a for _, a in expected], atol=1e-9)
+
+
+def test_estimate_velocities_same_track_twice_in_a_frame():
+    batch = DistanceEstimator()
+    single = DistanceEstimator()
+    for frame in range(1, 6):
+        distances = np.array([20.0 - frame, 19.5 - frame])
+        velocities, _ = batch.estimate_velocities([7, 7], distances, frame)
+        expected = [single.estimate_velocity(7, d, frame)[0] for d in distances]
+        np.testing.assert_allclose(velocities, expected)
+
+
+def test_full_history_evicts_stale_then_least_recently_seen():
+    estimator = DistanceEstimator()
+    capacity = DistanceEstimator.MAX_TRACKS
+
+    for tid in range(capacity):
+        estimator.estimate_velocity(tid, 10.0, frame_number=1)
+    # Track 0 stays fresh; the rest go stale
+    frame = 1 + DistanceEstimator.STALE_TRACK_FRAMES + 1
+    estimator.estimate_velocity(0, 9.0, frame)
+
+    estimator.estimate_velocity(capacity, 10.0, frame)
+    assert set(estimator._slot_of_id) == {0, capacity}
+    assert len(estimator._free_slots) == capacity - 2
+
+    # Nothing stale: the least recently seen track is dropped instead
+    for tid in range(capacity + 1, 2 * capacity - 1):
+        estimator.estimate_velocity(tid, 10.0, frame)
+    estimator.estimate_velocity(0, 8.0, frame + 1)
+    estimator.estimate_velocity(2 * capacity, 10.0, frame + 1)
+    assert 0 in estimator._slot_of_id
+    assert capacity not in estimator._slot_of_id
+    assert len(estimator._slot_of_id) == capacity
+
+
+def test_new_track_starts_with_empty_history():
+    estimator = DistanceEstimator()
+    estimator.estimate_velocity(1, 30.0, 1)
+    estimator.estimate_velocity(1, 29.0, 2)
+    estimator._free_slots.append(estimator._slot_of_id.pop(1))
+    # A track taking over the slot must not see the old samples
+    assert estimator.estimate_velocity(2, 50.0, 3) == (0.0, 0.0)
+
+
+def test_process_tracked_objects_matches_per_object_path():
+    rng = random.Random(2)
+    batch = DistanceEstimator()
+    single = DistanceEstimator()
+    classes = ['car', 'truck', 'motorcycle', 'person', 'unknown']
+    boxes = {tid: [rng.uniform(0, 1000), 300.0, 0.0, 0.0] for tid in range(6)}
+
+    for frame in range(1, 60):
+        objs = []
+        for tid, box in boxes.items():
+            box[2] = box[0] + 80
+            box[3] = box[1] + max(1.0, 40 + frame * rng.uniform(0.5, 1.5))
+            objs.append({'id': tid, 'bbox': list(box), 'class_name': classes[tid % len(classes)]})
+        # An object without a track id, and a degenerate box
+        objs.append({'bbox': [10.0, 10.0, 50.0, 90.0], 'class_name': 'car'})
+        objs.append({'id': 99, 'bbox': [10.0, 10.0, 50.0, 10.0], 'class_name': 'car'})
+
+        got = batch.process_tracked_objects([dict(o) for o in objs], 720, frame)
+        for obj, result in zip(objs, got):
+            if 'id' not in obj:
+                assert result['relative_velocity'] == 0.0
+                assert result['ttc'] is None
+                expected_distance = single.estimate_distance_bbox(obj['bbox'], 'car', 720)
+                assert result['distance'] == pytest.approx(expected_distance)
+                assert result['risk_level'] == single.classify_risk(expected_distance)
+                continue
+            expected = single.process_tracked_object(dict(obj), 720, frame)
+            for key in ('distance', 'relative_velocity', 'acceleration', 'closing_speed'):
+                assert result[key] == pytest.approx(expected[key], abs=1e-6)
+            assert result['ttc'] == pytest.approx(expected['ttc'])
+            assert result['risk_level'] == expected['risk_level']
+            assert result['is_approaching'] == expected['is_approaching']
@@ -0,0 +1,123 @@
+"""
+SignTracker tests
+=================
+The slot-pool tracker is checked against the dict-based tracker it replaced.
+"""
+
+import random
+
+from perception.traffic.traffic_sign_v11 import SignTracker
+
+
+class DictSignTracker:
+    """Reference: the original {sign_id: data} implementation."""
+
+    def __init__(self, persistence_frames=90, iou_threshold=0.5):
+        self.persistence_frames = persistence_frames
+        self.iou_threshold = iou_threshold
+        self.tracked_signs = {}
+        self.next_sign_id = 1
+        self.frame_number = 0
+
+    @staticmethod
+    def _iou(a, b):
+        x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+        x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+        if x2 < x1 or y2 < y1:
+            return 0.0
+        inter = (x2 - x1) * (y2 - y1)
+        union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+        return inter / union if union > 0 else 0.0
+
+    def update(self, detections):
+        self.frame_number += 1
+        new_ids = []
+        for det in detections:
+            matched = None
+            for sign_id, sign in self.tracked_signs.items():
+                if sign['type'] == det['sign_type'] and self._iou(det['bbox'], sign['bbox']) >= self.iou_threshold:
+                    matched = sign_id
+                    break
+            if matched:
+                self.tracked_signs[matched]['last_seen'] = self.frame_number
+                self.tracked_signs[matched]['bbox'] = det['bbox']
+            else:
+                sign_id = self.next_sign_id
+                self.next_sign_id += 1
+                self.tracked_signs[sign_id] = {
+                    'bbox': det['bbox'], 'type': det['sign_type'], 'last_seen': self.frame_number,
+                }
+                new_ids.append(sign_id)
+        for sign_id in [
+            s for s, sign in self.tracked_signs.items()
+            if self.frame_number - sign['last_seen'] > self.persistence_frames
+        ]:
+            del self.tracked_signs[sign_id]
+        return new_ids
+
+
+def random_frames(n_frames, seed):
+    rng = random.Random(seed)
+    types = ['stop sign', 'speed_limit_50', 'yield']
+    # A few signs drifting slowly, appearing intermittently
+    signs = [
+        (rng.choice(types), rng.uniform(0, 600), rng.uniform(0, 300), rng.uniform(20, 80))
+        for _ in range(12)
+    ]
+    for frame in range(n_frames):
+        detections = []
+        for sign_type, x, y, size in signs:
+            if rng.random() < 0.3:
+                dx = frame * 0.5 + rng.uniform(-3, 3)
+                detections.append({
+                    'sign_type': sign_type,
+                    'bbox': [int(x + dx), int(y), int(x + dx + size), int(y + size)],
+                })
+        yield detections
+
+
+def test_matches_dict_tracker():
+    for seed in range(5):
+        tracker = SignTracker(persistence_frames=10)
+        reference = DictSignTracker(persistence_frames=10)
+        for detections in random_frames(300, seed):
+            new = tracker.update([dict(d) for d in detections])
+            assert [d['sign_id'] for d in new] == reference.update([dict(d) for d in detections])
+            assert all(d['is_new'] for d in new)
+
+
+def test_stale_signs_free_their_slots():
+    tracker = SignTracker(persistence_frames=2)
+    det = {'sign_type': 'yield', 'bbox': [0, 0, 10, 10]}
+    assert len(tracker.update([dict(det)])) == 1
+    for _ in range(3):
+        tracker.update([])
+    assert not tracker._active.any()
+    assert len(tracker._free_slots) == SignTracker.MAX_SIGNS
+    # Expired: the same sign is new again
+    assert tracker.update([dict(det)])[0]['sign_id'] == 2
+
+
+def test_full_pool_evicts_least_recently_seen():
+    tracker = SignTracker(persistence_frames=1000)
+    boxes = [[i * 20, 0, i * 20 + 10, 10] for i in range(SignTracker.MAX_SIGNS)]
+    for box in boxes:
+        tracker.update([{'sign_type': 'yield', 'bbox': box}])
+    # Refresh sign 1 so sign 2 is now the least recently seen
+    assert tracker.update([{'sign_type': 'yield', 'bbox': boxes[0]}]) == []
+
+    overflow = tracker.update([{'sign_type': 'yield', 'bbox': [5000, 0, 5010, 10]}])
+    assert overflow[0]['sign_id'] == SignTracker.MAX_SIGNS + 1
+    assert tracker._active.sum() == SignTracker.MAX_SIGNS
+    # Sign 1 survived; sign 2 was evicted and comes back as new
+    assert tracker.update([{'sign_type': 'yield', 'bbox': boxes[0]}]) == []
+    assert tracker.update([{'sign_type': 'yield', 'bbox': boxes[1]}])[0]['sign_id'] == SignTracker.MAX_SIGNS + 2
+
+
+def test_reset_forgets_signs():
+    tracker = SignTracker()
+    det = {'sign_type': 'stop sign', 'bbox': [0, 0, 10, 10]}
+    tracker.update([dict(det)])
+    tracker.reset()
+    assert tracker.frame_number == 0
+    assert tracker.update([dict(det)])[0]['sign_id'] == 1
@@ -48,6 +48,7 @@ CREATE INDEX IF NOT EXISTS idx_vehicles_owner ON vehicles(owner_id);
 CREATE TABLE IF NOT EXISTS videos (
     id SERIAL PRIMARY KEY,
     sha256_hash VARCHAR(64) UNIQUE NOT NULL,
+    head_sha256 VARCHAR(64),  -- SHA256 of the first MiB (early dedup)
     original_filename VARCHAR(255) NOT NULL,
     storage_path VARCHAR(500) NOT NULL,
     size_bytes BIGINT NOT NULL,
@@ -59,7 +60,11 @@ CREATE TABLE IF NOT EXISTS videos (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Existing databases created before head_sha256 was added
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS head_sha256 VARCHAR(64);
+
 CREATE INDEX IF NOT EXISTS idx_videos_hash ON videos(sha256_hash);
+CREATE INDEX IF NOT EXISTS idx_videos_head_hash ON videos(head_sha256);
 CREATE INDEX IF NOT EXISTS idx_videos_uploader ON videos(uploader_id);
 
 -- ================================================
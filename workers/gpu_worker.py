@@ -15,8 +15,10 @@ import os
 import sys
 import time
 import signal
+import functools
 import logging
 import argparse
+import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -81,10 +83,21 @@ class GPUWorker:
             self.database_url,
             min_size=2,
             max_size=5,
-            command_timeout=60
+            command_timeout=60,
+            init=self._init_connection
         )
         logger.info(f"Worker {self.worker_id} connected to database")
     
+    @staticmethod
+    async def _init_connection(conn):
+        """Let asyncpg encode/decode JSONB parameters from/to Python objects."""
+        await conn.set_type_codec(
+            'jsonb',
+            encoder=functools.partial(json.dumps, default=str),
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
+    
     async def shutdown(self):
         """Clean shutdown."""
         if self.pool:
@@ -97,6 +110,7 @@ class GPUWorker:
             logger.info("Loading AI pipeline...")
             from backend.perception.pipeline.video_pipeline_v11 import VideoPipelineV11
             self.pipeline = VideoPipelineV11(device=self.device)
+            self.pipeline.warmup()
             logger.info("AI pipeline loaded")
         return self.pipeline
     
@@ -108,14 +122,18 @@ class GPUWorker:
         """
         async with self.pool.acquire() as conn:
             async with conn.transaction():
+                # job_queue has no path columns: the input file lives on
+                # the videos row the job points at
                 row = await conn.fetchrow("""
-                    UPDATE job_queue 
+                    UPDATE job_queue j
                     SET status = 'processing',
                         worker_id = $1,
                         worker_heartbeat = NOW(),
                         started_at = NOW(),
-                        attempts = attempts + 1
-                    WHERE id = (
+                        attempts = j.attempts + 1
+                    FROM videos v
+                    WHERE v.id = j.video_id
+                      AND j.id = (
                         SELECT id FROM job_queue
                         WHERE status = 'pending'
                           AND attempts < max_attempts
@@ -123,7 +141,8 @@ class GPUWorker:
                         LIMIT 1
                         FOR UPDATE SKIP LOCKED
                     )
-                    RETURNING id, job_id, video_path, video_filename, video_type, device
+                    RETURNING j.id, j.job_id, v.storage_path AS video_path,
+                              v.original_filename AS video_filename, j.video_type, j.device
                 """, self.worker_id)
                 
                 if row:
@@ -214,20 +233,33 @@ class GPUWorker:
                 async with self._gpu_semaphore:
                     logger.info(f"[{self.worker_id}] GPU acquired, starting processing")
                     
-                    # Run AI pipeline (blocking)
-                    pipeline = self._load_pipeline()
-                    
-                    # Progress callback
-                    async def progress_callback(frame_idx, total_frames, events):
+                    loop = asyncio.get_event_loop()
+
+                    # Load AI pipeline in executor: model loading is blocking
+                    # CPU/disk work and would stall the heartbeat task
+                    pipeline = await loop.run_in_executor(None, self._load_pipeline)
+
+                    # Progress callback: called from the executor thread,
+                    # hand the DB write back to the event loop (once per %)
+                    last_progress = [-1]
+
+                    def progress_callback(frame_idx, total_frames, events):
+                        if total_frames <= 0:
+                            return
                         progress = int((frame_idx / total_frames) * 100)
-                        await self.update_progress(job_id, progress)
-                    
+                        if progress > last_progress[0]:
+                            last_progress[0] = progress
+                            asyncio.run_coroutine_threadsafe(
+                                self.update_progress(job_id, progress), loop
+                            )
+
                     # Process video with GPU lock held
-                    result = await asyncio.get_event_loop().run_in_executor(
+                    result = await loop.run_in_executor(
                         None,
                         pipeline.process_video,
                         input_path,
-                        output_path
+                        output_path,
+                        progress_callback
                     )
                     
                 logger.info(f"[{self.worker_id}] GPU released")
@@ -272,25 +304,37 @@ class GPUWorker:
         if not events:
             return
         
+        rows = [
+            (
+                job_id,
+                event.get('type', 'other'),
+                event.get('level', 'warning'),
+                event.get('time', 0),
+                event.get('frame'),
+                event.get('data', {}).get('message', ''),
+                event.get('data', {})
+            )
+            for event in events
+        ]
+        
+        # One prepared statement, pipelined over all rows
         async with self.pool.acquire() as conn:
-            for event in events:
-                await conn.execute("""
-                    INSERT INTO safety_events 
-                    (job_id, event_type, severity, timestamp_sec, frame_number, description, meta_data)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """,
-                    job_id,
-                    event.get('type', 'other'),
-                    event.get('level', 'warning'),
-                    event.get('time', 0),
-                    event.get('frame'),
-                    event.get('data', {}).get('message', ''),
-                    str(event.get('data', {}))
-                )
+            await conn.executemany("""
+                INSERT INTO safety_events 
+                (job_id, event_type, severity, timestamp_sec, frame_number, description, meta_data)
+                VALUES ($1, $2, $3, $4, $5, $6, $7)
+            """, rows)
     
     async def run(self):
         """Main worker loop."""
         await self.init()
+        
+        # Load models before claiming work so the first job isn't charged
+        # for weight loading and CUDA warmup while holding its lease
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._load_pipeline)
+        except Exception as e:
+            logger.error(f"AI pipeline preload failed, retrying on first job: {e}")
         logger.info(f"Worker {self.worker_id} starting main loop")
         
         idle_count = 0
@@ -321,12 +365,22 @@ def main():
     parser.add_argument('--worker-id', default=f"worker_{os.getpid()}")
     parser.add_argument('--device', default='cuda', choices=['cuda', 'cpu'])
     parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'))
+    parser.add_argument(
+        '--cv-threads', type=int, default=int(os.getenv('CV_NUM_THREADS', '1')),
+        help='OpenCV worker threads per process (supervisor runs several workers)'
+    )
     args = parser.parse_args()
     
     if not args.database_url:
         print("ERROR: DATABASE_URL environment variable required")
         sys.exit(1)
     
+    # Every worker process defaults to an OpenCV pool as wide as the machine;
+    # with numprocs workers (each already running decode/inference/encode on
+    # separate threads) that oversubscribes the CPU and stalls the pipeline
+    import cv2
+    cv2.setNumThreads(args.cv_threads)
+    
     worker = GPUWorker(
         worker_id=args.worker_id,
         database_url=args.database_url,